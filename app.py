@@ -15,6 +15,7 @@ import threading
 from datetime import datetime
 from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
+from flask_compress import Compress
 
 # --- Global Queue for Live Log Streamer ---
 # This queue is used by the custom logging handler to push log records
@@ -70,6 +71,17 @@ app = Flask(__name__)
 # This allows your frontend (e.g., curam-ai.com.au) to make requests to this backend API.
 CORS(app, origins=Config.CORS_ORIGINS)
 
+# --- Configure Response Compression ---
+# History and stats endpoints return multi-KB JSON; negotiate brotli/gzip for anything over 500 bytes.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
+# --- Pagination Caps ---
+# Upper bounds for the `limit` query parameter on history endpoints.
+MAX_HISTORY_LIMIT = 500
+MAX_USER_HISTORY_LIMIT = 100
+
 # --- Backend Services Initialization Function ---
 def initialize_services():
     """Initializes all custom backend services (Database, LLM, RSS, PropertyAnalysis, WebSearch, HealthChecker)
@@ -313,10 +325,10 @@ def api_info():
             'live_logs': 'GET /stream_logs',
             'get_users': 'GET /api/users',
             'get_user_stats': 'GET /api/users/{user_id}/stats',
-            'get_user_history': 'GET /api/users/{user_id}/history',
+            'get_user_history': f'GET /api/users/{{user_id}}/history?limit=1-{MAX_USER_HISTORY_LIMIT}',
             'get_questions': 'GET /api/property/questions',
             'analyze_property': 'POST /api/property/analyze',
-            'get_property_history': 'GET /api/property/history',
+            'get_property_history': f'GET /api/property/history?limit=1-{MAX_HISTORY_LIMIT}',
             'delete_property_query': 'DELETE /api/property/history/{query_id}',
             'get_property_stats': 'GET /api/property/stats'
         }
@@ -455,12 +467,8 @@ def get_user_history(user_id: str):
         }), 500
     
     try:
-        limit = request.args.get('limit', 20, type=int)
-        
-        # Validate and constrain the limit parameter
-        if not (1 <= limit <= 100): # Allow between 1 and 100 queries
-            logger.warning(f"Invalid history limit {limit} requested for user {user_id}. Defaulting to 20.")
-            limit = 20
+        # Clamp the limit parameter to between 1 and 100 queries
+        limit = max(1, min(request.args.get('limit', 20, type=int) or 20, MAX_USER_HISTORY_LIMIT))
         
         history = services['database'].get_query_history(limit=limit, user_id=user_id)
         
@@ -694,13 +702,10 @@ def get_property_history():
         }), 500
     
     try:
-        limit = request.args.get('limit', 50, type=int)
         user_id = request.args.get('user_id')  # Optional user filtering
         
-        # Validate and constrain the limit parameter
-        if not (1 <= limit <= 1000): # Allow between 1 and 1000 queries
-            logger.warning(f"Invalid history limit {limit} requested. Defaulting to 50.")
-            limit = 50
+        # Clamp the limit parameter so one request cannot materialize an unbounded history
+        limit = max(1, min(request.args.get('limit', 50, type=int) or 50, MAX_HISTORY_LIMIT))
         
         history = services['database'].get_query_history(limit=limit, user_id=user_id)
         
@@ -1,37 +1,173 @@
 import sqlite3
 import json
+import hashlib
+import atexit
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
 from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of queued query inserts written in one transaction
+WRITE_BATCH_SIZE = 100
+
+# How long an exact-match LLM response is served before the prompt is sent again
+LLM_CACHE_TTL_SECONDS = 3600
+MAX_LLM_CACHE_ENTRIES = 2000
+
+# Background analysis jobs kept; the oldest are forgotten beyond this
+MAX_TRACKED_JOBS = 500
+
 class PropertyDatabase:
     def __init__(self, db_path: str = 'property_intelligence.db'):
         self.db_path = db_path
+        
+        # One long-lived autocommit connection shared across threads; the lock serializes access
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA cache_size=-20000')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._lock = threading.Lock()
+        
         self.init_database()
+        
+        # Query inserts are queued and written in batches by a background thread
+        self._write_queue = queue.Queue()
+        self._writer = threading.Thread(target=self._flush_loop, name='property-db-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self._flush_pending)
     
     def init_database(self):
         """Initialize database tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Main queries table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS property_queries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    question TEXT NOT NULL,
-                    question_type TEXT DEFAULT 'custom',
-                    answer TEXT,
-                    processing_time REAL,
-                    success BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                # Main queries table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS property_queries (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        question TEXT NOT NULL,
+                        question_type TEXT DEFAULT 'custom',
+                        answer TEXT,
+                        processing_time REAL,
+                        success BOOLEAN DEFAULT 0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+            
+                # Indexes for the history, popular-questions and stats queries
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_queries_created ON property_queries(created_at DESC)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_queries_question_success ON property_queries(question, success)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_queries_success_time ON property_queries(success, processing_time)')
+            
+                # Last LLM model that passed a startup probe, per provider
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS model_cache (
+                        provider TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        verified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+            
+                # The former untimed prompt cache; exact-match responses now all live in llm_response_cache
+                cursor.execute('DROP TABLE IF EXISTS llm_cache')
+            
+                # Exact-match LLM responses keyed by a prompt hash, each with its own expiry (unix time)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS llm_response_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        response TEXT NOT NULL,
+                        expires_at REAL NOT NULL
+                    )
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_response_expires ON llm_response_cache(expires_at)')
+            
+                # Question embeddings and their responses, matched by cosine similarity
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS semantic_cache (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        namespace TEXT NOT NULL,
+                        embedding BLOB NOT NULL,
+                        response TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_semantic_namespace ON semantic_cache(namespace, id DESC)')
+            
+                # Validators and last parsed entries per scraped URL, for conditional GETs
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS data_source_cache (
+                        url TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_modified TEXT,
+                        parsed_entries_json TEXT NOT NULL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+            
+                # Intermediate pipeline output per query and stage
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS query_stages (
+                        query_id INTEGER NOT NULL,
+                        stage TEXT NOT NULL,
+                        data TEXT,
+                        PRIMARY KEY (query_id, stage)
+                    )
+                ''')
+            
+                # Processing logs table for detailed tracking
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS processing_logs (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        query_id INTEGER,
+                        stage TEXT NOT NULL,
+                        message TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        execution_time REAL,
+                        error_details TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (query_id) REFERENCES property_queries (id)
+                    )
+                ''')
+            
+                # Data sources tracking table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS data_sources (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL,
+                        url TEXT NOT NULL,
+                        source_type TEXT NOT NULL,
+                        category TEXT,
+                        last_accessed TIMESTAMP,
+                        last_status TEXT,
+                        success_count INTEGER DEFAULT 0,
+                        error_count INTEGER DEFAULT 0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+            
+                # Background analysis jobs, shared by every worker process that opens this file
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS pipeline_jobs (
+                        job_id TEXT PRIMARY KEY,
+                        status TEXT NOT NULL,
+                        question TEXT NOT NULL,
+                        question_type TEXT NOT NULL,
+                        processing_updates TEXT NOT NULL DEFAULT '[]',
+                        result TEXT,
+                        error TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at REAL NOT NULL
+                    )
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_updated ON pipeline_jobs(updated_at)')
+            
             logger.info("Database initialized successfully")
             
         except Exception as e:
@@ -39,21 +175,23 @@ class PropertyDatabase:
             raise e
     
     def store_query(self, question: str, answer: str, question_type: str = 'custom', 
-                   processing_time: float = 0, success: bool = True) -> int:
-        """Store a query and its answer"""
+                   processing_time: float = 0, success: bool = True, wait: bool = True) -> Optional[int]:
+        """Store a query and its answer; returns its ID, or None immediately if wait is False"""
+        row = (question, question_type, answer, processing_time, success)
+        if not wait:
+            # Fire-and-forget writes are batched by the writer thread
+            self._write_queue.put((row, Future()))
+            return None
+        
+        # Callers that need the ID get a direct insert rather than waiting out the batching window
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO property_queries (question, question_type, answer, processing_time, success)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (question, question_type, answer, processing_time, success))
-            
-            query_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.execute('''
+                    INSERT INTO property_queries (question, question_type, answer, processing_time, success)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', row)
+                query_id = cursor.lastrowid
             logger.info(f"Stored query with ID: {query_id}")
             return query_id
             
@@ -61,22 +199,200 @@ class PropertyDatabase:
             logger.error(f"Failed to store query: {str(e)}")
             raise e
     
+    def _flush_loop(self):
+        """Write queued inserts, grouping whatever has accumulated into one transaction"""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+    
+    def _flush_pending(self):
+        """Write any inserts still queued at interpreter exit"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
+    
+    def _write_batch(self, batch: List):
+        """Insert a batch of queued queries and resolve their futures with the new IDs"""
+        rows = [row for row, _ in batch]
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    cursor.executemany('''
+                        INSERT INTO property_queries (question, question_type, answer, processing_time, success)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', rows)
+                    last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
+            
+            # The write lock is held for the whole transaction, so the batch received consecutive IDs
+            first_id = last_id - len(rows) + 1
+            for offset, (_, future) in enumerate(batch):
+                future.set_result(first_id + offset)
+            
+        except Exception as e:
+            logger.error(f"Failed to write query batch: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+    
+    def record_pipeline_run(self, query_id: int, stages: Dict[str, str], logs: List[tuple],
+                            answer: str, processing_time: float, success: bool):
+        """Write a finished pipeline run in one transaction
+
+        logs holds (stage, message, status, execution_time, error_details) tuples.
+        """
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    cursor.execute('''
+                        UPDATE property_queries SET answer = ?, processing_time = ?, success = ?
+                        WHERE id = ?
+                    ''', (answer, processing_time, success, query_id))
+                    cursor.executemany('''
+                        INSERT OR REPLACE INTO query_stages (query_id, stage, data)
+                        VALUES (?, ?, ?)
+                    ''', [(query_id, stage, data) for stage, data in stages.items()])
+                    cursor.executemany('''
+                        INSERT INTO processing_logs (query_id, stage, message, status, execution_time, error_details)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', [(query_id, *log) for log in logs])
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
+            
+            logger.info(f"Recorded pipeline run for query {query_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed to record pipeline run: {str(e)}")
+    
+    def update_data_source_status(self, source_name: str, status: str, success: bool = True):
+        """Update data source access status"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('''
+                    UPDATE data_sources
+                    SET last_accessed = CURRENT_TIMESTAMP,
+                        last_status = ?,
+                        success_count = success_count + ?,
+                        error_count = error_count + ?
+                    WHERE name = ?
+                ''', (status, int(success), int(not success), source_name))
+            
+        except Exception as e:
+            logger.error(f"Failed to update data source status: {str(e)}")
+    
+    def create_job(self, job_id: str, question: str, question_type: str):
+        """Record a queued analysis job, forgetting the oldest beyond MAX_TRACKED_JOBS"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                cursor.execute('''
+                    INSERT INTO pipeline_jobs (job_id, status, question, question_type, updated_at)
+                    VALUES (?, 'queued', ?, ?, ?)
+                ''', (job_id, question, question_type, time.time()))
+                cursor.execute('''
+                    DELETE FROM pipeline_jobs WHERE job_id NOT IN (
+                        SELECT job_id FROM pipeline_jobs ORDER BY updated_at DESC LIMIT ?
+                    )
+                ''', (MAX_TRACKED_JOBS,))
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+    
+    def update_job(self, job_id: str, status: str, processing_updates: Optional[List[Dict]] = None,
+                   result: Optional[Dict] = None, error: Optional[str] = None):
+        """Update a job's status, progress and outcome; fields left as None keep their stored value"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('''
+                    UPDATE pipeline_jobs
+                    SET status = ?,
+                        processing_updates = COALESCE(?, processing_updates),
+                        result = COALESCE(?, result),
+                        error = COALESCE(?, error),
+                        updated_at = ?
+                    WHERE job_id = ?
+                ''', (
+                    status,
+                    json.dumps(processing_updates) if processing_updates is not None else None,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    time.time(),
+                    job_id
+                ))
+            
+        except Exception as e:
+            logger.error(f"Failed to update job {job_id}: {str(e)}")
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a tracked analysis job, or None if it is unknown"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('''
+                    SELECT status, question, question_type, processing_updates, result, error, created_at, updated_at
+                    FROM pipeline_jobs WHERE job_id = ?
+                ''', (job_id,))
+            
+                row = cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            return {
+                'status': row[0],
+                'question': row[1],
+                'question_type': row[2],
+                'processing_updates': json.loads(row[3]),
+                'result': json.loads(row[4]) if row[4] else None,
+                'error': row[5],
+                'created_at': row[6],
+                'updated_at': row[7]
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get job {job_id}: {str(e)}")
+            return None
+    
     def get_query_history(self, limit: int = 50) -> List[Dict]:
         """Get recent query history"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
             
-            cursor.execute('''
-                SELECT id, question, question_type, answer, success, 
-                       processing_time, created_at
-                FROM property_queries
-                ORDER BY created_at DESC
-                LIMIT ?
-            ''', (limit,))
+                cursor.execute('''
+                    SELECT id, question, question_type, answer, success, 
+                           processing_time, created_at
+                    FROM property_queries
+                    ORDER BY created_at DESC
+                    LIMIT ?
+                ''', (limit,))
             
-            results = cursor.fetchall()
-            conn.close()
+                results = cursor.fetchall()
             
             history = []
             for row in results:
@@ -99,20 +415,19 @@ class PropertyDatabase:
     def get_popular_questions(self, limit: int = 10) -> List[Dict]:
         """Get most frequently asked questions"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
             
-            cursor.execute('''
-                SELECT question, COUNT(*) as count, MAX(created_at) as last_asked
-                FROM property_queries
-                WHERE success = 1
-                GROUP BY question
-                ORDER BY count DESC, last_asked DESC
-                LIMIT ?
-            ''', (limit,))
+                cursor.execute('''
+                    SELECT question, COUNT(*) as count, MAX(created_at) as last_asked
+                    FROM property_queries
+                    WHERE success = 1
+                    GROUP BY question
+                    ORDER BY count DESC, last_asked DESC
+                    LIMIT ?
+                ''', (limit,))
             
-            results = cursor.fetchall()
-            conn.close()
+                results = cursor.fetchall()
             
             questions = []
             for row in results:
@@ -128,22 +443,181 @@ class PropertyDatabase:
             logger.error(f"Failed to get popular questions: {str(e)}")
             return []
     
-    def get_database_stats(self) -> Dict:
-        """Get database statistics"""
+    def get_cached_model(self, provider: str, max_age_hours: int = 24) -> Optional[str]:
+        """Get the last verified model for a provider if it is recent enough"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('''
+                    SELECT model FROM model_cache
+                    WHERE provider = ? AND verified_at >= datetime('now', ?)
+                ''', (provider, f'-{max_age_hours} hours'))
+            
+                row = cursor.fetchone()
+            
+            return row[0] if row else None
+            
+        except Exception as e:
+            logger.error(f"Failed to get cached model: {str(e)}")
+            return None
+    
+    def store_cached_model(self, provider: str, model: str):
+        """Record the model that passed verification for a provider"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('''
+                    INSERT OR REPLACE INTO model_cache (provider, model, verified_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                ''', (provider, model))
+            
+        except Exception as e:
+            logger.error(f"Failed to store cached model: {str(e)}")
+    
+    def _prompt_hash(self, prompt: str, provider: str) -> str:
+        """Hash a provider and prompt into an exact-match cache key"""
+        return hashlib.sha256(f"{provider}:{prompt}".encode()).hexdigest()
+    
+    def cache_get(self, prompt: str, provider: str) -> Optional[str]:
+        """Get an unexpired cached LLM response for an identical prompt"""
+        return self.get_cached_response(self._prompt_hash(prompt, provider))
+    
+    def cache_set(self, prompt: str, provider: str, response: str, ttl: float = LLM_CACHE_TTL_SECONDS):
+        """Store an LLM response for later identical prompts, for ttl seconds"""
+        self.set_cached_response(self._prompt_hash(prompt, provider), response, ttl)
+    
+    def get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Get an unexpired LLM response stored under cache_key"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('SELECT response FROM llm_response_cache WHERE cache_key = ? AND expires_at > ?',
+                               (cache_key, time.time()))
+            
+                row = cursor.fetchone()
+            
+            return row[0] if row else None
+            
+        except Exception as e:
+            logger.error(f"Failed to read LLM response cache: {str(e)}")
+            return None
+    
+    def set_cached_response(self, cache_key: str, response: str, ttl: float):
+        """Store an LLM response under cache_key for ttl seconds, evicting expired and excess entries"""
+        try:
+            now = time.time()
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    cursor.execute('''
+                        INSERT OR REPLACE INTO llm_response_cache (cache_key, response, expires_at)
+                        VALUES (?, ?, ?)
+                    ''', (cache_key, response, now + ttl))
+                    cursor.execute('DELETE FROM llm_response_cache WHERE expires_at <= ?', (now,))
+                    # Past the cap, the entries closest to expiry go first
+                    cursor.execute('''
+                        DELETE FROM llm_response_cache WHERE cache_key IN (
+                            SELECT cache_key FROM llm_response_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                        )
+                    ''', (MAX_LLM_CACHE_ENTRIES,))
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
+            
+        except Exception as e:
+            logger.error(f"Failed to write LLM response cache: {str(e)}")
+    
+    def get_semantic_entries(self, namespace: str, limit: int = 1000) -> List[tuple]:
+        """Get the newest (embedding, response) pairs stored for a namespace"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._lock:
+                cursor = self._conn.cursor()
             
-            cursor.execute('SELECT COUNT(*) FROM property_queries')
-            total_queries = cursor.fetchone()[0]
+                cursor.execute('''
+                    SELECT embedding, response FROM semantic_cache
+                    WHERE namespace = ?
+                    ORDER BY id DESC
+                    LIMIT ?
+                ''', (namespace, limit))
             
-            cursor.execute('SELECT COUNT(*) FROM property_queries WHERE success = 1')
-            successful_queries = cursor.fetchone()[0]
+                return cursor.fetchall()
             
-            cursor.execute('SELECT AVG(processing_time) FROM property_queries WHERE processing_time IS NOT NULL')
-            avg_processing_time = cursor.fetchone()[0] or 0
+        except Exception as e:
+            logger.error(f"Failed to read semantic cache: {str(e)}")
+            return []
+    
+    def store_semantic_entry(self, namespace: str, embedding: bytes, response: str):
+        """Store an embedding and the response it produced"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('''
+                    INSERT INTO semantic_cache (namespace, embedding, response)
+                    VALUES (?, ?, ?)
+                ''', (namespace, embedding, response))
+            
+        except Exception as e:
+            logger.error(f"Failed to write semantic cache: {str(e)}")
+    
+    def get_source_cache(self, url: str) -> Optional[Dict]:
+        """Get the stored validators and parsed entries for a scraped URL"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('''
+                    SELECT etag, last_modified, parsed_entries_json FROM data_source_cache WHERE url = ?
+                ''', (url,))
+            
+                row = cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            return {
+                'etag': row[0],
+                'last_modified': row[1],
+                'parsed_entries_json': row[2]
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to read data source cache: {str(e)}")
+            return None
+    
+    def set_source_cache(self, url: str, etag: Optional[str], last_modified: Optional[str], parsed_entries_json: str):
+        """Store the validators and parsed entries from a successful fetch"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+            
+                cursor.execute('''
+                    INSERT OR REPLACE INTO data_source_cache (url, etag, last_modified, parsed_entries_json, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (url, etag, last_modified, parsed_entries_json))
+            
+        except Exception as e:
+            logger.error(f"Failed to write data source cache: {str(e)}")
+    
+    def get_database_stats(self) -> Dict:
+        """Get database statistics"""
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
             
-            conn.close()
+                # One scan for all three aggregates; AVG already skips NULL processing times
+                cursor.execute('''
+                    SELECT COUNT(*), SUM(success = 1), AVG(processing_time)
+                    FROM property_queries
+                ''')
+                total_queries, successful_queries, avg_processing_time = cursor.fetchone()
+                successful_queries = successful_queries or 0
+                avg_processing_time = avg_processing_time or 0
             
             return {
                 'total_queries': total_queries,
@@ -159,11 +633,9 @@ class PropertyDatabase:
     def clear_all_data(self):
         """Clear all data from the database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM property_queries')
-            conn.commit()
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                cursor.execute('DELETE FROM property_queries')
             logger.info("Database cleared successfully")
         except Exception as e:
             logger.error(f"Failed to clear database: {str(e)}")
@@ -1,55 +1,224 @@
+import io
 import os
 import time
-import json
+import hashlib
+import orjson
 import logging
 import asyncio
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional, Generator, Any
+from typing import Callable, Dict, List, Optional, Generator, Any
 import requests
-import feedparser
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 import re
 
-# LLM imports
-import anthropic
-import google.generativeai as genai
-
 # Local imports
 from database import PropertyDatabase
+from services.llm_cache import LLMCache, SemanticCache
 
 logger = logging.getLogger(__name__)
 
+CLAUDE_MODEL = "claude-3-sonnet-20240229"
+
+# Semantic-cache namespace marking Claude analyses split out of the batched preset prewarm
+PREWARM_NAMESPACE = 'claude_analysis:preset_batch'
+
+# Seconds allowed for a semantic-cache embedding before the cache is skipped
+EMBEDDING_TIMEOUT_SECONDS = 2
+
+SCRAPE_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+SCRAPE_TIMEOUT = (3.05, 10) # (connect, read) seconds
+MAX_COUNCIL_RSS_ENTRIES = 10
+
+BRISBANE_SUBURBS = (
+    'South Brisbane', 'Fortitude Valley', 'New Farm', 'Teneriffe', 'Paddington',
+    'Toowong', 'St Lucia', 'Woolloongabba', 'West End', 'Kangaroo Point',
+    'Spring Hill', 'Petrie Terrace', 'Milton', 'Auchenflower', 'Rosalie',
+    'Newstead', 'Bowen Hills', 'Herston', 'Kelvin Grove', 'Red Hill',
+    'Ashgrove', 'Bardon', 'Indooroopilly', 'Taringa', 'Chapel Hill'
+)
+# Longest names first so an alternation never stops at a shorter overlapping name
+_SUBURB_PATTERN = re.compile(
+    '|'.join(re.escape(suburb) for suburb in sorted(BRISBANE_SUBURBS, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+# Prompt text is fixed apart from its slots, so only .format runs per request
+_CLAUDE_PROMPT_TMPL = """
+            You are a Brisbane property research analyst. Analyze this question and provide a strategic approach for gathering relevant data:
+
+            Question: "{question}"
+
+            Please provide:
+            1. What specific Brisbane areas/suburbs should be prioritized
+            2. What types of data sources would be most relevant
+            3. What timeframe should be considered
+            4. What key information should be extracted
+
+            Focus on Brisbane-specific property development, infrastructure, and market trends.
+            Be specific about Brisbane suburbs, council areas, and local property dynamics.
+            """
+
+_GEMINI_PROMPT_TMPL = """
+            You are a Brisbane property market analyst. Analyze the following data and provide insights for this question:
+
+            Question: "{question}"
+
+            Data Sources:
+            {data_summary}
+
+            Please provide:
+            1. Key findings relevant to the question
+            2. Trends and patterns in Brisbane property market
+            3. Specific suburbs or areas mentioned
+            4. Any significant developments or changes
+            5. Market implications
+
+            Focus on Brisbane-specific insights and provide actionable information for property professionals.
+            """
+
+# Mock records per question topic, in the order topics are added to the results
+_MOCK_DATA_BY_TOPIC = {
+    'development': (
+        {
+            'source': 'Brisbane City Council',
+            'title': 'Major Mixed-Use Development Approved for South Brisbane',
+            'summary': 'Council has approved a 45-story mixed-use development at 123 Main Street, South Brisbane, including 400 residential units and commercial space.',
+            'link': 'https://www.brisbane.qld.gov.au/development/app-12345',
+            'published': '2024-01-15',
+            'type': 'development_approval'
+        },
+        {
+            'source': 'Brisbane City Council',
+            'title': 'Residential Development Application - Fortitude Valley',
+            'summary': 'New 28-story residential tower proposed for James Street, Fortitude Valley, with 220 apartments and ground floor retail.',
+            'link': 'https://www.brisbane.qld.gov.au/development/app-12346',
+            'published': '2024-01-10',
+            'type': 'development_application'
+        }
+    ),
+    'infrastructure': (
+        {
+            'source': 'Queensland Government',
+            'title': 'Cross River Rail Project Update',
+            'summary': 'Cross River Rail construction continues with new stations at Woolloongabba and Boggo Road expected to boost property values in surrounding areas.',
+            'link': 'https://www.crossriverrail.qld.gov.au/news/update-jan-2024',
+            'published': '2024-01-12',
+            'type': 'infrastructure_news'
+        },
+    ),
+    'suburb': (
+        {
+            'source': 'Property Observer',
+            'title': 'Paddington Emerges as Brisbane\'s Hottest Suburb',
+            'summary': 'Paddington has seen 15% price growth in the past quarter, driven by its proximity to the city and character housing stock.',
+            'link': 'https://www.propertyobserver.com.au/paddington-brisbane-growth',
+            'published': '2024-01-08',
+            'type': 'market_analysis'
+        },
+    )
+}
+
+# Each named group marks a topic; a single scan of the question finds every topic it mentions
+_MOCK_TOPIC_PATTERN = re.compile(
+    r'(?P<development>development|application)|(?P<infrastructure>infrastructure|project)|(?P<suburb>suburb|trending)',
+    re.IGNORECASE
+)
+
+PRESET_QUESTIONS = (
+    "What new development applications were submitted in Brisbane this month?",
+    "Which Brisbane suburbs are trending in property news?",
+    "Are there any major infrastructure projects affecting property values?",
+    "What zoning changes have been approved recently?",
+    "Which areas have the most development activity?"
+)
+# Set view of the presets so classifying a question is a hash lookup rather than a list scan
+_PRESET_QUESTION_SET = frozenset(PRESET_QUESTIONS)
+
+# The LLM SDKs pull in large dependency trees, so they are imported on first use only
+@functools.lru_cache(maxsize=1)
+def _get_anthropic():
+    import anthropic
+    return anthropic
+
+@functools.lru_cache(maxsize=1)
+def _get_genai():
+    import google.generativeai as genai
+    return genai
+
+@functools.lru_cache(maxsize=1)
+def _get_claude_client():
+    """Create the shared Claude client, or None when it is not configured"""
+    try:
+        claude_key = os.getenv('CLAUDE_API_KEY')
+        if claude_key:
+            client = _get_anthropic().Anthropic(api_key=claude_key)
+            logger.info("Claude client initialized")
+            return client
+        logger.warning("CLAUDE_API_KEY not found")
+    except Exception as e:
+        logger.error(f"Claude initialization failed: {str(e)}")
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _get_gemini_model():
+    """Create the shared Gemini model, or None when it is not configured"""
+    try:
+        gemini_key = os.getenv('GEMINI_API_KEY')
+        if gemini_key:
+            genai = _get_genai()
+            genai.configure(api_key=gemini_key)
+            model = genai.GenerativeModel('gemini-pro')
+            logger.info("Gemini client initialized")
+            return model
+        logger.warning("GEMINI_API_KEY not found")
+    except Exception as e:
+        logger.error(f"Gemini initialization failed: {str(e)}")
+    return None
+
+# Answer timestamps show at most minute precision, so each format is rendered once per minute
+@functools.lru_cache(maxsize=8)
+def _format_minute(fmt: str, minute: int) -> str:
+    """Format the current local time; minute only keys the cache"""
+    return datetime.now().strftime(fmt)
+
+def _format_now(fmt: str) -> str:
+    """Format the current local time, reusing the result for the rest of the minute"""
+    return _format_minute(fmt, int(time.time() // 60))
+
 class BrisbanePropertyPipeline:
     def __init__(self):
         """Initialize the multi-LLM pipeline"""
         self.db = PropertyDatabase()
+        # Identical prompts (the preset questions especially) are answered from this cache
+        self.llm_cache = LLMCache(self.db)
         
-        # Initialize LLM clients
-        self.claude_client = None
-        self.gemini_model = None
+        # Clients are shared process-wide so every pipeline reuses the same connection pools
+        self.claude_client = _get_claude_client()
+        self.gemini_model = _get_gemini_model()
         
-        # Initialize Claude
-        try:
-            claude_key = os.getenv('CLAUDE_API_KEY')
-            if claude_key:
-                self.claude_client = anthropic.Anthropic(api_key=claude_key)
-                logger.info("Claude client initialized")
-            else:
-                logger.warning("CLAUDE_API_KEY not found")
-        except Exception as e:
-            logger.error(f"Claude initialization failed: {str(e)}")
+        # Pooled keep-alive session for scraping; transient gateway errors are retried with backoff
+        self._http = requests.Session()
+        self._http.headers.update({'User-Agent': SCRAPE_USER_AGENT})
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
         
-        # Initialize Gemini
-        try:
-            gemini_key = os.getenv('GEMINI_API_KEY')
-            if gemini_key:
-                genai.configure(api_key=gemini_key)
-                self.gemini_model = genai.GenerativeModel('gemini-pro')
-                logger.info("Gemini client initialized")
-            else:
-                logger.warning("GEMINI_API_KEY not found")
-        except Exception as e:
-            logger.error(f"Gemini initialization failed: {str(e)}")
+        # Background workers for pipeline stages that can overlap
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='pipeline-stage')
+        # Separate pool so scrape fan-out never waits behind the stages that submit it
+        self._scrape_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='pipeline-scrape')
+        
+        # Paraphrased questions reuse earlier answers; embeddings come from Gemini when it is configured
+        self.semantic_cache = SemanticCache(self.db, self._embed_text if self.gemini_model else None)
         
         # Brisbane-specific data sources
         self.data_sources = {
@@ -58,16 +227,17 @@ class BrisbanePropertyPipeline:
             'realestate_news': 'https://www.realestate.com.au/news/brisbane/',
             'qld_govt_data': 'https://www.data.qld.gov.au/'
         }
+        
+        # The preset questions are analyzed together in one Claude call at startup, off the request path
+        threading.Thread(target=self._prewarm_presets, name='preset-prewarm', daemon=True).start()
     
     def get_preset_questions(self) -> List[str]:
         """Return the 5 preset Brisbane property questions"""
-        return [
-            "What new development applications were submitted in Brisbane this month?",
-            "Which Brisbane suburbs are trending in property news?",
-            "Are there any major infrastructure projects affecting property values?",
-            "What zoning changes have been approved recently?",
-            "Which areas have the most development activity?"
-        ]
+        return list(PRESET_QUESTIONS)
+    
+    def is_preset_question(self, question: str) -> bool:
+        """Check whether a question is one of the preset questions"""
+        return question in _PRESET_QUESTION_SET
     
     def process_query(self, question: str, query_type: str = 'custom') -> Generator[Dict, None, None]:
         """
@@ -76,30 +246,40 @@ class BrisbanePropertyPipeline:
         """
         start_time = time.time()
         query_id = None
+        # Stage results and log entries are buffered and written in one transaction when the run ends
+        stages = {}
+        logs = []
+        
+        # Both LLM stages share one question embedding, computed only if an exact-match cache misses
+        embed_question = self._question_embedder(question)
         
         try:
             # Store query in database
-            query_id = self.db.store_query(question, query_type)
+            query_id = self.db.store_query(question, '', query_type, success=False)
             yield self._create_progress_update('started', f'Processing query: {question}')
             
-            # Stage 1: Claude Analysis
+            # Stages 1 and 2 are independent: scraping runs in the background while Claude analyzes
             yield self._create_progress_update('claude_analysis', 'Analyzing question with Claude...')
-            claude_analysis = self._analyze_with_claude(question)
+            scrape_future = self._executor.submit(self._scrape_relevant_data, None, question)
+            yield self._create_progress_update('scraping', 'Fetching Brisbane property data...')
+            claude_chunks = []
+            for text in self._stream_claude_analysis(question, embed_question):
+                claude_chunks.append(text)
+                yield self._create_progress_update('claude_token', text)
+            claude_analysis = ''.join(claude_chunks)
             
             if claude_analysis:
-                self.db.update_query_stage(query_id, 'claude_analysis', claude_analysis)
-                self.db.add_processing_log(query_id, 'claude_analysis', 'Claude analysis completed', 'success')
+                stages['claude_analysis'] = claude_analysis
+                logs.append(('claude_analysis', 'Claude analysis completed', 'success', None, None))
                 yield self._create_progress_update('claude_complete', 'Claude analysis complete')
             else:
                 raise Exception("Claude analysis failed")
             
-            # Stage 2: Data Scraping
-            yield self._create_progress_update('scraping', 'Fetching Brisbane property data...')
-            scraped_data = self._scrape_relevant_data(claude_analysis, question)
+            scraped_data = scrape_future.result()
             
             if scraped_data:
-                self.db.update_query_stage(query_id, 'scraped_data', json.dumps(scraped_data))
-                self.db.add_processing_log(query_id, 'scraping', f'Scraped {len(scraped_data)} sources', 'success')
+                stages['scraped_data'] = orjson.dumps(scraped_data).decode()
+                logs.append(('scraping', f'Scraped {len(scraped_data)} sources', 'success', None, None))
                 yield self._create_progress_update('scraping_complete', f'Found {len(scraped_data)} relevant sources')
             else:
                 yield self._create_progress_update('scraping_warning', 'Limited data available, proceeding with cached information')
@@ -107,11 +287,15 @@ class BrisbanePropertyPipeline:
             
             # Stage 3: Gemini Processing
             yield self._create_progress_update('gemini_processing', 'Processing data with Gemini Pro...')
-            gemini_insights = self._process_with_gemini(scraped_data, question)
+            gemini_chunks = []
+            for text in self._stream_gemini_insights(scraped_data, question, embed_question):
+                gemini_chunks.append(text)
+                yield self._create_progress_update('gemini_token', text)
+            gemini_insights = ''.join(gemini_chunks)
             
             if gemini_insights:
-                self.db.update_query_stage(query_id, 'gemini_processing', gemini_insights)
-                self.db.add_processing_log(query_id, 'gemini_processing', 'Gemini processing completed', 'success')
+                stages['gemini_processing'] = gemini_insights
+                logs.append(('gemini_processing', 'Gemini processing completed', 'success', None, None))
                 yield self._create_progress_update('gemini_complete', 'Gemini analysis complete')
             else:
                 raise Exception("Gemini processing failed")
@@ -122,8 +306,9 @@ class BrisbanePropertyPipeline:
             
             # Store final result
             processing_time = time.time() - start_time
-            self.db.update_query_stage(query_id, 'final_answer', final_answer)
-            self.db.add_processing_log(query_id, 'complete', f'Processing completed in {processing_time:.2f}s', 'success', processing_time)
+            stages['final_answer'] = final_answer
+            logs.append(('complete', f'Processing completed in {processing_time:.2f}s', 'success', processing_time, None))
+            self.db.record_pipeline_run(query_id, stages, logs, final_answer, processing_time, True)
             
             yield self._create_progress_update('complete', f'Analysis complete! ({processing_time:.1f}s)', {
                 'final_answer': final_answer,
@@ -136,10 +321,63 @@ class BrisbanePropertyPipeline:
             logger.error(error_msg)
             
             if query_id:
-                self.db.add_processing_log(query_id, 'error', error_msg, 'error', error_details=str(e))
+                logs.append(('error', error_msg, 'error', None, str(e)))
+                self.db.record_pipeline_run(query_id, stages, logs, '', time.time() - start_time, False)
             
             yield self._create_progress_update('error', error_msg)
     
+    def _prewarm_presets(self):
+        """Analyze all uncached preset questions in a single Claude call and cache each analysis"""
+        # Batch answers come from a different prompt, so they are only offered as semantic matches
+        if not self.claude_client or not self.semantic_cache.enabled:
+            return
+        
+        embeddings = {question: self.semantic_cache.embed(question) for question in PRESET_QUESTIONS}
+        questions = [
+            question for question, embedding in embeddings.items()
+            if embedding is not None
+            and self.semantic_cache.lookup('claude_analysis', embedding) is None
+            and self.semantic_cache.lookup(PREWARM_NAMESPACE, embedding) is None
+        ]
+        if not questions:
+            return
+        
+        numbered = '\n'.join(f'{number}. "{question}"' for number, question in enumerate(questions, 1))
+        prompt = f"""
+            You are a Brisbane property research analyst. For each question below, provide a strategic approach for gathering relevant data:
+
+{numbered}
+
+            For each question, provide:
+            1. What specific Brisbane areas/suburbs should be prioritized
+            2. What types of data sources would be most relevant
+            3. What timeframe should be considered
+            4. What key information should be extracted
+
+            Focus on Brisbane-specific property development, infrastructure, and market trends.
+            Return only a JSON array of {len(questions)} strings, one complete analysis per question, in the same order.
+            """
+        
+        try:
+            response = self.claude_client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=4096,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            text = response.content[0].text
+            analyses = orjson.loads(text[text.index('['):text.rindex(']') + 1])
+        except Exception as e:
+            logger.warning(f"Preset prewarm failed: {str(e)}")
+            return
+        
+        if len(analyses) != len(questions) or not all(isinstance(analysis, str) and analysis for analysis in analyses):
+            logger.warning("Preset prewarm returned an unexpected shape, skipping")
+            return
+        
+        for question, analysis in zip(questions, analyses):
+            self.semantic_cache.store(PREWARM_NAMESPACE, embeddings[question], analysis)
+        logger.info(f"Prewarmed Claude analysis for {len(questions)} preset questions")
+    
     def _create_progress_update(self, status: str, message: str, data: Dict = None) -> Dict:
         """Create standardized progress update"""
         update = {
@@ -151,62 +389,97 @@ class BrisbanePropertyPipeline:
             update['data'] = data
         return update
     
-    def _analyze_with_claude(self, question: str) -> Optional[str]:
-        """Claude analyzes the question and determines data strategy"""
+    def _build_claude_prompt(self, question: str) -> str:
+        """Build the Claude strategy prompt for a question"""
+        return _CLAUDE_PROMPT_TMPL.format(question=question)
+    
+    def _question_embedder(self, question: str) -> Callable[[], Any]:
+        """Return a function that embeds the question on first call and reuses the vector after"""
+        embedding = []
+        
+        def embed_question():
+            if not embedding:
+                embedding.append(self.semantic_cache.embed(question))
+            return embedding[0]
+        
+        return embed_question
+    
+    def _stream_claude_analysis(self, question: str, embed_question: Optional[Callable[[], Any]] = None) -> Generator[str, None, None]:
+        """Claude analyzes the question and determines data strategy, yielding text as it is generated"""
         if not self.claude_client:
-            return self._mock_claude_analysis(question)
+            yield self._mock_claude_analysis(question)
+            return
         
+        chunks = []
         try:
-            prompt = f"""
-            You are a Brisbane property research analyst. Analyze this question and provide a strategic approach for gathering relevant data:
-
-            Question: "{question}"
-
-            Please provide:
-            1. What specific Brisbane areas/suburbs should be prioritized
-            2. What types of data sources would be most relevant
-            3. What timeframe should be considered
-            4. What key information should be extracted
-
-            Focus on Brisbane-specific property development, infrastructure, and market trends.
-            Be specific about Brisbane suburbs, council areas, and local property dynamics.
-            """
-            
-            response = self.claude_client.messages.create(
-                model="claude-3-sonnet-20240229",
+            prompt = self._build_claude_prompt(question)
+            
+            model = CLAUDE_MODEL
+            cache_key = self.llm_cache.make_key(model, prompt)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached Claude analysis")
+                yield cached
+                return
+            
+            question_embedding = (embed_question or self._question_embedder(question))()
+            cached = self.semantic_cache.lookup('claude_analysis', question_embedding)
+            if cached is None:
+                cached = self.semantic_cache.lookup(PREWARM_NAMESPACE, question_embedding)
+            if cached is not None:
+                yield cached
+                return
+            
+            with self.claude_client.messages.stream(
+                model=model,
                 max_tokens=1500,
                 messages=[{"role": "user", "content": prompt}]
-            )
+            ) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
             
-            return response.content[0].text
+            analysis = ''.join(chunks)
+            self.llm_cache.set(cache_key, analysis)
+            self.semantic_cache.store('claude_analysis', question_embedding, analysis)
             
         except Exception as e:
             logger.error(f"Claude analysis failed: {str(e)}")
-            return self._mock_claude_analysis(question)
+            # Text already streamed stays; the mock only stands in when nothing was generated
+            if not chunks:
+                yield self._mock_claude_analysis(question)
+    
+    def _embed_text(self, text: str) -> List[float]:
+        """Embed text with Gemini for semantic cache matching"""
+        # Short timeout: a slow embedding fails open to a cache miss rather than delaying the real call
+        result = _get_genai().embed_content(
+            model='models/embedding-001', content=text, task_type='semantic_similarity',
+            request_options={'timeout': EMBEDDING_TIMEOUT_SECONDS}
+        )
+        return result['embedding']
     
-    def _scrape_relevant_data(self, claude_analysis: str, question: str) -> List[Dict]:
+    def _scrape_relevant_data(self, claude_analysis: Optional[str], question: str) -> List[Dict]:
         """Scrape Brisbane property data based on Claude's analysis"""
-        scraped_data = []
+        scrapers = {
+            'Brisbane Council RSS': self._scrape_brisbane_council_rss,
+            'Property News': self._scrape_property_news
+        }
         
-        # Try to scrape Brisbane Council RSS
-        try:
-            council_data = self._scrape_brisbane_council_rss()
-            if council_data:
-                scraped_data.extend(council_data)
-                self.db.update_data_source_status('Brisbane Council RSS', 'success')
-        except Exception as e:
-            logger.error(f"Brisbane Council RSS scraping failed: {str(e)}")
-            self.db.update_data_source_status('Brisbane Council RSS', 'failed', False)
+        # Sources are fetched concurrently, so the stage takes as long as the slowest one
+        futures = {self._scrape_executor.submit(scraper): source_name for source_name, scraper in scrapers.items()}
+        results = {}
+        for future in as_completed(futures):
+            source_name = futures[future]
+            try:
+                results[source_name] = future.result()
+                if results[source_name]:
+                    self.db.update_data_source_status(source_name, 'success')
+            except Exception as e:
+                logger.error(f"{source_name} scraping failed: {str(e)}")
+                self.db.update_data_source_status(source_name, 'failed', False)
         
-        # Try to scrape property news
-        try:
-            news_data = self._scrape_property_news()
-            if news_data:
-                scraped_data.extend(news_data)
-                self.db.update_data_source_status('Property News', 'success')
-        except Exception as e:
-            logger.error(f"Property news scraping failed: {str(e)}")
-            self.db.update_data_source_status('Property News', 'failed', False)
+        # Keep the configured source order regardless of which finished first
+        scraped_data = [item for source_name in scrapers for item in results.get(source_name) or []]
         
         # If no real data, use mock data
         if not scraped_data:
@@ -220,42 +493,83 @@ class BrisbanePropertyPipeline:
             # Use a more accessible Brisbane Council feed
             rss_url = "https://www.brisbane.qld.gov.au/about-council/news-media/news/rss"
             
-            response = requests.get(rss_url, timeout=10)
+            # Conditional GET: an unchanged feed answers 304 and the stored entries are reused unparsed
+            cached = self.db.get_source_cache(rss_url)
+            request_headers = {}
+            if cached:
+                if cached['etag']:
+                    request_headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    request_headers['If-Modified-Since'] = cached['last_modified']
+            
+            response = self._http.get(rss_url, headers=request_headers, timeout=SCRAPE_TIMEOUT)
+            if response.status_code == 304 and cached:
+                logger.info("Brisbane Council RSS not modified, reusing stored entries")
+                return orjson.loads(cached['parsed_entries_json'])
             response.raise_for_status()
             
-            feed = feedparser.parse(response.content)
-            
-            data = []
-            for entry in feed.entries[:10]:  # Limit to recent entries
-                data.append({
-                    'source': 'Brisbane City Council',
-                    'title': entry.title,
-                    'summary': entry.summary if hasattr(entry, 'summary') else '',
-                    'link': entry.link,
-                    'published': entry.published if hasattr(entry, 'published') else '',
-                    'type': 'government_news'
-                })
+            data = self._parse_council_rss(response.content)
             
+            self.db.set_source_cache(
+                rss_url,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                orjson.dumps(data).decode()
+            )
             return data
             
         except Exception as e:
             logger.error(f"Brisbane Council RSS scraping failed: {str(e)}")
             return []
     
+    def _parse_council_rss(self, content: bytes) -> List[Dict]:
+        """Parse the first RSS items from the council feed, falling back to feedparser for other formats"""
+        data = []
+        try:
+            # lxml streams <item> elements and parsing stops once enough entries are read
+            for _, item in etree.iterparse(io.BytesIO(content), events=('end',), tag='item', resolve_entities=False):
+                data.append({
+                    'source': 'Brisbane City Council',
+                    'title': (item.findtext('title') or '').strip(),
+                    'summary': (item.findtext('description') or '').strip(),
+                    'link': (item.findtext('link') or '').strip(),
+                    'published': (item.findtext('pubDate') or '').strip(),
+                    'type': 'government_news'
+                })
+                item.clear()
+                if len(data) >= MAX_COUNCIL_RSS_ENTRIES:
+                    break
+        except etree.XMLSyntaxError as e:
+            logger.warning(f"Fast RSS parse failed, falling back to feedparser: {str(e)}")
+            data = []
+        
+        if data:
+            return data
+        
+        # Atom and malformed feeds have no parseable <item> elements
+        import feedparser
+        feed = feedparser.parse(content)
+        for entry in feed.entries[:MAX_COUNCIL_RSS_ENTRIES]:  # Limit to recent entries
+            data.append({
+                'source': 'Brisbane City Council',
+                'title': entry.title,
+                'summary': entry.summary if hasattr(entry, 'summary') else '',
+                'link': entry.link,
+                'published': entry.published if hasattr(entry, 'published') else '',
+                'type': 'government_news'
+            })
+        return data
+    
     def _scrape_property_news(self) -> List[Dict]:
         """Scrape Brisbane property news"""
         try:
-            # Simple web scraping for property news
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
             # Try a simple property news search
             url = "https://www.propertyobserver.com.au/location/brisbane"
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._http.get(url, timeout=SCRAPE_TIMEOUT)
             response.raise_for_status()
             
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract article titles and links (basic example)
@@ -280,104 +594,69 @@ class BrisbanePropertyPipeline:
     
     def _get_mock_brisbane_data(self, question: str) -> List[Dict]:
         """Generate realistic mock Brisbane property data"""
-        mock_data = []
-        
-        # Development applications mock data
-        if 'development' in question.lower() or 'application' in question.lower():
-            mock_data.extend([
-                {
-                    'source': 'Brisbane City Council',
-                    'title': 'Major Mixed-Use Development Approved for South Brisbane',
-                    'summary': 'Council has approved a 45-story mixed-use development at 123 Main Street, South Brisbane, including 400 residential units and commercial space.',
-                    'link': 'https://www.brisbane.qld.gov.au/development/app-12345',
-                    'published': '2024-01-15',
-                    'type': 'development_approval'
-                },
-                {
-                    'source': 'Brisbane City Council',
-                    'title': 'Residential Development Application - Fortitude Valley',
-                    'summary': 'New 28-story residential tower proposed for James Street, Fortitude Valley, with 220 apartments and ground floor retail.',
-                    'link': 'https://www.brisbane.qld.gov.au/development/app-12346',
-                    'published': '2024-01-10',
-                    'type': 'development_application'
-                }
-            ])
-        
-        # Infrastructure projects mock data
-        if 'infrastructure' in question.lower() or 'project' in question.lower():
-            mock_data.extend([
-                {
-                    'source': 'Queensland Government',
-                    'title': 'Cross River Rail Project Update',
-                    'summary': 'Cross River Rail construction continues with new stations at Woolloongabba and Boggo Road expected to boost property values in surrounding areas.',
-                    'link': 'https://www.crossriverrail.qld.gov.au/news/update-jan-2024',
-                    'published': '2024-01-12',
-                    'type': 'infrastructure_news'
-                }
-            ])
-        
-        # Suburb trending mock data
-        if 'suburb' in question.lower() or 'trending' in question.lower():
-            mock_data.extend([
-                {
-                    'source': 'Property Observer',
-                    'title': 'Paddington Emerges as Brisbane\'s Hottest Suburb',
-                    'summary': 'Paddington has seen 15% price growth in the past quarter, driven by its proximity to the city and character housing stock.',
-                    'link': 'https://www.propertyobserver.com.au/paddington-brisbane-growth',
-                    'published': '2024-01-08',
-                    'type': 'market_analysis'
-                }
-            ])
-        
-        return mock_data
+        topics = {match.lastgroup for match in _MOCK_TOPIC_PATTERN.finditer(question)}
+        return [dict(record) for topic, records in _MOCK_DATA_BY_TOPIC.items() if topic in topics for record in records]
     
-    def _process_with_gemini(self, scraped_data: List[Dict], question: str) -> Optional[str]:
-        """Process scraped data with Gemini Pro"""
+    def _stream_gemini_insights(self, scraped_data: List[Dict], question: str,
+                               embed_question: Optional[Callable[[], Any]] = None) -> Generator[str, None, None]:
+        """Process scraped data with Gemini Pro, yielding text as it is generated"""
         if not self.gemini_model:
-            return self._mock_gemini_processing(scraped_data, question)
+            yield self._mock_gemini_processing(scraped_data, question)
+            return
         
+        chunks = []
         try:
             # Prepare data for Gemini
-            data_summary = ""
-            for item in scraped_data:
-                data_summary += f"Source: {item['source']}\n"
-                data_summary += f"Title: {item['title']}\n"
-                data_summary += f"Summary: {item['summary']}\n"
-                data_summary += f"Published: {item['published']}\n\n"
-            
-            prompt = f"""
-            You are a Brisbane property market analyst. Analyze the following data and provide insights for this question:
-
-            Question: "{question}"
-
-            Data Sources:
-            {data_summary}
-
-            Please provide:
-            1. Key findings relevant to the question
-            2. Trends and patterns in Brisbane property market
-            3. Specific suburbs or areas mentioned
-            4. Any significant developments or changes
-            5. Market implications
-
-            Focus on Brisbane-specific insights and provide actionable information for property professionals.
-            """
+            data_summary = ''.join(
+                f"Source: {item['source']}\nTitle: {item['title']}\nSummary: {item['summary']}\nPublished: {item['published']}\n\n"
+                for item in scraped_data
+            )
+            
+            prompt = _GEMINI_PROMPT_TMPL.format(question=question, data_summary=data_summary)
+            
+            cache_key = self.llm_cache.make_key('gemini-pro', prompt)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached Gemini insights")
+                yield cached
+                return
+            
+            # Similar questions only share insights when they were drawn from the same scraped items
+            titles_hash = hashlib.sha256('\n'.join(item['title'] for item in scraped_data).encode()).hexdigest()[:16]
+            namespace = f'gemini_processing:{titles_hash}'
+            question_embedding = (embed_question or self._question_embedder(question))()
+            cached = self.semantic_cache.lookup(namespace, question_embedding)
+            if cached is not None:
+                yield cached
+                return
             
-            response = self.gemini_model.generate_content(prompt)
-            return response.text
+            for chunk in self.gemini_model.generate_content(prompt, stream=True):
+                chunks.append(chunk.text)
+                yield chunk.text
+            
+            insights = ''.join(chunks)
+            self.llm_cache.set(cache_key, insights)
+            self.semantic_cache.store(namespace, question_embedding, insights)
             
         except Exception as e:
             logger.error(f"Gemini processing failed: {str(e)}")
-            return self._mock_gemini_processing(scraped_data, question)
+            # Text already streamed stays; the mock only stands in when nothing was generated
+            if not chunks:
+                yield self._mock_gemini_processing(scraped_data, question)
     
     def _format_final_answer(self, gemini_insights: str, question: str, scraped_data: List[Dict]) -> str:
         """Format the final answer with enhanced presentation"""
         try:
             # Create a professional summary
+            # One pass collects the source types and the top 3 most relevant items
             sources_count = len(scraped_data)
-            source_types = set(item['type'] for item in scraped_data)
-            
-            final_answer = f"""# Brisbane Property Intelligence Analysis
+            source_types = set()
+            top_items = []
+            for index, item in enumerate(scraped_data):
+                source_types.add(item['type'])
+                if index < 3:
+                    top_items.append(item)
+            parts = [f"""# Brisbane Property Intelligence Analysis
 
 ## Query: {question}
 
@@ -387,37 +666,36 @@ class BrisbanePropertyPipeline:
 ## Data Sources Analyzed
 - **Total Sources**: {sources_count}
 - **Source Types**: {', '.join(source_types)}
-- **Analysis Date**: {datetime.now().strftime('%B %d, %Y')}
+- **Analysis Date**: {_format_now('%B %d, %Y')}
 
 ## Key Brisbane Areas Mentioned
-"""
+"""]
             
             # Extract Brisbane suburbs/areas mentioned
             brisbane_areas = self._extract_brisbane_areas(gemini_insights)
             if brisbane_areas:
-                for area in brisbane_areas:
-                    final_answer += f"- {area}\n"
+                parts.extend(f"- {area}\n" for area in brisbane_areas)
             else:
-                final_answer += "- Various Brisbane metropolitan areas\n"
+                parts.append("- Various Brisbane metropolitan areas\n")
             
-            final_answer += f"""
+            parts.append("""
 ## Recent Developments
-"""
+""")
             
             # Add recent development summaries
-            for item in scraped_data[:3]:  # Top 3 most relevant
-                final_answer += f"- **{item['title']}** ({item['source']})\n"
+            for item in top_items:
+                parts.append(f"- **{item['title']}** ({item['source']})\n")
                 if item['summary']:
-                    final_answer += f"  {item['summary'][:150]}...\n"
+                    parts.append(f"  {item['summary'][:150]}...\n")
             
-            final_answer += f"""
+            parts.append(f"""
 ## Market Implications
 Based on the analysis, key implications for Brisbane property market include ongoing development activity, infrastructure investment impact, and changing suburban preferences.
 
-*Analysis generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}*
-"""
+*Analysis generated on {_format_now('%B %d, %Y at %I:%M %p')}*
+""")
             
-            return final_answer
+            return ''.join(parts)
             
         except Exception as e:
             logger.error(f"Final answer formatting failed: {str(e)}")
@@ -425,20 +703,9 @@ Based on the analysis, key implications for Brisbane property market include ong
     
     def _extract_brisbane_areas(self, text: str) -> List[str]:
         """Extract Brisbane suburb names from text"""
-        brisbane_suburbs = [
-            'South Brisbane', 'Fortitude Valley', 'New Farm', 'Teneriffe', 'Paddington',
-            'Toowong', 'St Lucia', 'Woolloongabba', 'West End', 'Kangaroo Point',
-            'Spring Hill', 'Petrie Terrace', 'Milton', 'Auchenflower', 'Rosalie',
-            'Newstead', 'Bowen Hills', 'Herston', 'Kelvin Grove', 'Red Hill',
-            'Ashgrove', 'Bardon', 'Indooroopilly', 'Taringa', 'Chapel Hill'
-        ]
-        
-        found_areas = []
-        for suburb in brisbane_suburbs:
-            if suburb.lower() in text.lower():
-                found_areas.append(suburb)
-        
-        return found_areas
+        # One case-insensitive pass over the text finds every suburb; results keep the list order
+        found = {match.lower() for match in _SUBURB_PATTERN.findall(text)}
+        return [suburb for suburb in BRISBANE_SUBURBS if suburb.lower() in found]
     
     def _mock_claude_analysis(self, question: str) -> str:
         """Mock Claude analysis when API is unavailable"""
@@ -462,7 +729,7 @@ This analysis will provide comprehensive insights into Brisbane's property lands
         """Mock Gemini processing when API is unavailable"""
         sources_count = len(scraped_data)
         
-        return f"""Brisbane Property Market Analysis - {datetime.now().strftime('%B %Y')}
+        return f"""Brisbane Property Market Analysis - {_format_now('%B %Y')}
 
 **Key Findings:**
 - Analyzed {sources_count} current data sources
@@ -492,13 +759,12 @@ Brisbane's property market shows sustained growth driven by infrastructure inves
         popular = self.db.get_popular_questions(limit)
         
         # Combine with preset questions
-        preset_questions = self.get_preset_questions()
         
         # Create combined list
         all_questions = []
         
         # Add preset questions first
-        for question in preset_questions:
+        for question in PRESET_QUESTIONS:
             all_questions.append({
                 'question': question,
                 'type': 'preset',
@@ -507,7 +773,7 @@ Brisbane's property market shows sustained growth driven by infrastructure inves
         
         # Add popular questions from database
         for item in popular:
-            if item['question'] not in preset_questions:
+            if item['question'] not in _PRESET_QUESTION_SET:
                 all_questions.append({
                     'question': item['question'],
                     'type': 'popular',
@@ -6,29 +6,155 @@ Add these endpoints to your existing app.py file
 from flask import request, jsonify, Response
 import json
 import logging
+import threading
+import time
+import uuid
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Dict, List, Optional
 from llm_pipeline import BrisbanePropertyPipeline
 
-# Initialize the pipeline
-property_pipeline = BrisbanePropertyPipeline()
 logger = logging.getLogger(__name__)
 
+# The pipeline builds its LLM clients and database on construction, so it is
+# created on first use rather than at import time to keep worker boot fast.
+_pipeline_singleton = None
+_pipeline_lock = threading.Lock()
+
+def pipeline() -> BrisbanePropertyPipeline:
+    """Return the shared pipeline, initializing it on first call"""
+    global _pipeline_singleton
+    if _pipeline_singleton is None:
+        with _pipeline_lock:
+            if _pipeline_singleton is None:
+                _pipeline_singleton = BrisbanePropertyPipeline()
+    return _pipeline_singleton
+
+# Response timestamps are informational, so one ISO string is reused for up to
+# 100ms instead of formatting datetime.now() on every request.
+TIMESTAMP_RESOLUTION_SECONDS = 0.1
+_cached_timestamp = ''
+_cached_timestamp_expires = 0.0
+
+def _timestamp() -> str:
+    """Return the current time as an ISO string, refreshed at most every 100ms"""
+    global _cached_timestamp, _cached_timestamp_expires
+    now = time.monotonic()
+    if now >= _cached_timestamp_expires:
+        _cached_timestamp = datetime.now().isoformat()
+        _cached_timestamp_expires = now + TIMESTAMP_RESOLUTION_SECONDS
+    return _cached_timestamp
+
+# Static response bodies are serialized once and served as raw bytes
+_index_bytes = None
+_preset_questions_fragment = None
+
+def _get_preset_questions_fragment() -> orjson.Fragment:
+    """Return the preset question list as pre-encoded JSON"""
+    global _preset_questions_fragment
+    if _preset_questions_fragment is None:
+        _preset_questions_fragment = orjson.Fragment(orjson.dumps(pipeline().get_preset_questions()))
+    return _preset_questions_fragment
+
+# Upper bound on rows a single history request may materialize
+MAX_HISTORY_LIMIT = 500
+
+# Async analyses run on a background pool so request workers return immediately;
+# clients poll /api/property/jobs/<job_id>. Job state lives in the SQLite database
+# so a poll answered by any worker process sees it.
+# A queued or running job not updated for this long belonged to a worker that exited
+STALE_JOB_SECONDS = 600
+_job_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='pipeline-job')
+
+def _run_pipeline_job(job_id: str, question: str, question_type: str):
+    """Run the pipeline for a queued job and record its progress"""
+    db = pipeline().db
+    db.update_job(job_id, 'running')
+    processing_updates = []
+    result = None
+    error = None
+    
+    try:
+        for update in pipeline().process_query(question, question_type):
+            # Token-level chunks only matter to live streams; polled jobs keep the stage updates
+            if update['status'].endswith('_token'):
+                continue
+            processing_updates.append(update)
+            if update['status'] == 'complete':
+                result = update.get('data', {})
+            elif update['status'] == 'error':
+                error = update.get('message')
+            db.update_job(job_id, 'running', processing_updates)
+        
+        db.update_job(job_id, 'complete' if result is not None else 'failed', processing_updates, result, error)
+        
+    except Exception as e:
+        logger.error(f"Pipeline job {job_id} failed: {str(e)}")
+        db.update_job(job_id, 'failed', processing_updates, error=str(e))
+
+def _submit_pipeline_job(question: str, question_type: str) -> str:
+    """Queue a pipeline run and return its job ID"""
+    job_id = uuid.uuid4().hex
+    pipeline().db.create_job(job_id, question, question_type)
+    _job_executor.submit(_run_pipeline_job, job_id, question, question_type)
+    return job_id
+
+@dataclass(slots=True)
+class AnalyzeResponse:
+    """Response body for a polled property analysis job"""
+    success: bool
+    job_id: str
+    status: str
+    question: str
+    question_type: str
+    final_answer: str = ''
+    processing_time: float = 0.0
+    query_id: Optional[int] = None
+    processing_updates: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+    timestamp: str = ''
+    
+    @classmethod
+    def from_job(cls, job_id: str, job: Dict) -> 'AnalyzeResponse':
+        """Build the response from a tracked job"""
+        final_result = job['result'] or {}
+        status = job['status']
+        error = job['error']
+        if status in ('queued', 'running') and time.time() - job['updated_at'] > STALE_JOB_SECONDS:
+            status = 'failed'
+            error = error or 'Job was interrupted before it finished'
+        return cls(
+            success=status != 'failed',
+            job_id=job_id,
+            status=status,
+            question=job['question'],
+            question_type=job['question_type'],
+            final_answer=final_result.get('final_answer', ''),
+            processing_time=final_result.get('processing_time', 0),
+            query_id=final_result.get('query_id'),
+            processing_updates=list(job['processing_updates']),
+            error=error,
+            timestamp=_timestamp()
+        )
+
 # ===== BRISBANE PROPERTY INTELLIGENCE ENDPOINTS =====
 
 @app.route('/api/property/questions', methods=['GET'])
 def get_property_questions():
     """Return dropdown questions (preset + popular from database)"""
     try:
-        questions = property_pipeline.get_popular_questions(15)
+        questions = pipeline().get_popular_questions(15)
         
         response = {
             'success': True,
             'questions': questions,
-            'preset_questions': property_pipeline.get_preset_questions(),
-            'timestamp': datetime.now().isoformat()
+            'preset_questions': _get_preset_questions_fragment(),
+            'timestamp': _timestamp()
         }
         
-        return jsonify(response)
+        return Response(orjson.dumps(response), mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Get questions error: {str(e)}")
@@ -51,8 +177,7 @@ def analyze_property_question():
             }), 400
         
         # Determine question type
-        preset_questions = property_pipeline.get_preset_questions()
-        question_type = 'preset' if question in preset_questions else 'custom'
+        question_type = 'preset' if pipeline().is_preset_question(question) else 'custom'
         
         logger.info(f"Processing property question: {question} (type: {question_type})")
         
@@ -60,7 +185,10 @@ def analyze_property_question():
         updates = []
         final_result = None
         
-        for update in property_pipeline.process_query(question, question_type):
+        for update in pipeline().process_query(question, question_type):
+            # Token-level chunks only matter to live streams
+            if update['status'].endswith('_token'):
+                continue
             updates.append(update)
             if update['status'] == 'complete':
                 final_result = update.get('data', {})
@@ -74,7 +202,7 @@ def analyze_property_question():
             'final_answer': final_result.get('final_answer', '') if final_result else '',
             'processing_time': final_result.get('processing_time', 0) if final_result else 0,
             'query_id': final_result.get('query_id') if final_result else None,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _timestamp()
         }
         
         return jsonify(response)
@@ -86,6 +214,68 @@ def analyze_property_question():
             'error': str(e)
         }), 500
 
+@app.route('/api/property/analyze-async', methods=['POST'])
+def analyze_property_question_async():
+    """Main LLM pipeline endpoint - queues the analysis and returns a job ID"""
+    try:
+        data = request.get_json()
+        question = data.get('question', '').strip()
+        
+        if not question:
+            return jsonify({
+                'success': False,
+                'error': 'Question is required'
+            }), 400
+        
+        # Determine question type
+        question_type = 'preset' if pipeline().is_preset_question(question) else 'custom'
+        
+        logger.info(f"Queueing property question: {question} (type: {question_type})")
+        
+        job_id = _submit_pipeline_job(question, question_type)
+        
+        response = {
+            'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'question': question,
+            'question_type': question_type,
+            'poll_url': f'/api/property/jobs/{job_id}',
+            'timestamp': _timestamp()
+        }
+        
+        return jsonify(response), 202
+        
+    except Exception as e:
+        logger.error(f"Property analysis error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/property/jobs/<job_id>', methods=['GET'])
+def get_analysis_job(job_id):
+    """Poll the status and result of a queued analysis"""
+    try:
+        job = pipeline().db.get_job(job_id)
+        
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': 'Job not found'
+            }), 404
+        
+        response = AnalyzeResponse.from_job(job_id, job)
+        
+        return Response(orjson.dumps(response), mimetype='application/json')
+        
+    except Exception as e:
+        logger.error(f"Get job error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/property/analyze-stream', methods=['POST'])
 def analyze_property_stream():
     """Stream processing updates in real-time"""
@@ -100,8 +290,7 @@ def analyze_property_stream():
             }), 400
         
         # Determine question type
-        preset_questions = property_pipeline.get_preset_questions()
-        question_type = 'preset' if question in preset_questions else 'custom'
+        question_type = 'preset' if pipeline().is_preset_question(question) else 'custom'
         
         def generate_stream():
             """Generate streaming response"""
@@ -110,7 +299,7 @@ def analyze_property_stream():
                 yield f"data: {json.dumps({'status': 'started', 'message': f'Processing: {question}'})}\n\n"
                 
                 # Process through pipeline
-                for update in property_pipeline.process_query(question, question_type):
+                for update in pipeline().process_query(question, question_type):
                     yield f"data: {json.dumps(update)}\n\n"
                 
                 # Send completion signal
@@ -120,7 +309,7 @@ def analyze_property_stream():
                 error_update = {
                     'status': 'error',
                     'message': f'Streaming error: {str(e)}',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _timestamp()
                 }
                 yield f"data: {json.dumps(error_update)}\n\n"
         
@@ -146,14 +335,14 @@ def analyze_property_stream():
 def get_property_history():
     """Get query history"""
     try:
-        limit = request.args.get('limit', 50, type=int)
-        history = property_pipeline.get_query_history(limit)
+        limit = max(1, min(request.args.get('limit', 50, type=int) or 50, MAX_HISTORY_LIMIT))
+        history = pipeline().get_query_history(limit)
         
         response = {
             'success': True,
             'history': history,
             'count': len(history),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _timestamp()
         }
         
         return jsonify(response)
@@ -169,7 +358,7 @@ def get_property_history():
 def get_query_details(query_id):
     """Get detailed information about a specific query"""
     try:
-        details = property_pipeline.get_query_details(query_id)
+        details = pipeline().get_query_details(query_id)
         
         if not details:
             return jsonify({
@@ -180,7 +369,7 @@ def get_query_details(query_id):
         response = {
             'success': True,
             'query_details': details,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _timestamp()
         }
         
         return jsonify(response)
@@ -196,12 +385,12 @@ def get_query_details(query_id):
 def reset_property_session():
     """Reset database/session"""
     try:
-        property_pipeline.reset_database()
+        pipeline().reset_database()
         
         response = {
             'success': True,
             'message': 'Database reset successfully',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _timestamp()
         }
         
         return jsonify(response)
@@ -217,14 +406,14 @@ def reset_property_session():
 def get_property_stats():
     """Get database and processing statistics"""
     try:
-        stats = property_pipeline.get_database_stats()
-        data_sources = property_pipeline.get_data_sources_status()
+        stats = pipeline().get_database_stats()
+        data_sources = pipeline().get_data_sources_status()
         
         response = {
             'success': True,
             'stats': stats,
             'data_sources': data_sources,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _timestamp()
         }
         
         return jsonify(response)
@@ -251,7 +440,7 @@ def email_property_results():
             }), 400
         
         # Get query details
-        query_details = property_pipeline.get_query_details(query_id)
+        query_details = pipeline().get_query_details(query_id)
         if not query_details:
             return jsonify({
                 'success': False,
@@ -263,7 +452,7 @@ def email_property_results():
             'success': True,
             'message': f'Results would be sent to {email}',
             'query_id': query_id,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _timestamp()
         }
         
         return jsonify(response)
@@ -277,10 +466,9 @@ def email_property_results():
 
 # ===== UPDATE MAIN INDEX ENDPOINT =====
 
-@app.route('/')
-def index():
-    """Updated main endpoint to reflect Brisbane Property Intelligence"""
-    return jsonify({
+def _build_index_payload() -> dict:
+    """Build the static API description served by the index endpoint"""
+    return {
         'name': 'Brisbane Property Intelligence API',
         'version': '1.0.0',
         'description': 'Multi-LLM Brisbane property analysis with Claude, Gemini, and real-time data scraping',
@@ -288,8 +476,9 @@ def index():
             'health': '/health',
             'property_questions': 'GET /api/property/questions',
             'property_analyze': 'POST /api/property/analyze',
+            'property_job_status': 'GET /api/property/jobs/<job_id>',
             'property_stream': 'POST /api/property/analyze-stream',
-            'property_history': 'GET /api/property/history',
+            'property_history': f'GET /api/property/history?limit=1-{MAX_HISTORY_LIMIT}',
             'property_query_details': 'GET /api/property/query/<id>',
             'property_reset': 'POST /api/property/reset',
             'property_stats': 'GET /api/property/stats',
@@ -304,18 +493,26 @@ def index():
             'Brisbane-specific Insights'
         ],
         'ai_services': {
-            'claude': 'Available' if property_pipeline.claude_client else 'Mock Mode',
-            'gemini': 'Available' if property_pipeline.gemini_model else 'Mock Mode',
+            'claude': 'Available' if pipeline().claude_client else 'Mock Mode',
+            'gemini': 'Available' if pipeline().gemini_model else 'Mock Mode',
             'data_scraping': 'Active'
         },
-        'preset_questions': property_pipeline.get_preset_questions(),
+        'preset_questions': pipeline().get_preset_questions(),
         'data_sources': [
             'Brisbane City Council RSS',
             'Property Observer Brisbane',
             'RealEstate.com.au News',
             'Queensland Government Data'
         ]
-    })
+    }
+
+@app.route('/')
+def index():
+    """Updated main endpoint to reflect Brisbane Property Intelligence"""
+    global _index_bytes
+    if _index_bytes is None:
+        _index_bytes = orjson.dumps(_build_index_payload())
+    return Response(_index_bytes, mimetype='application/json')
 
 # ===== HEALTH CHECK UPDATE =====
 
@@ -327,19 +524,19 @@ def health():
         
         # Test database connection
         try:
-            stats = property_pipeline.get_database_stats()
+            stats = pipeline().get_database_stats()
             database_status = True
         except Exception as e:
             database_status = False
             logger.error(f"Database health check failed: {str(e)}")
         
         # Test LLM connections
-        claude_status = property_pipeline.claude_client is not None
-        gemini_status = property_pipeline.gemini_model is not None
+        claude_status = pipeline().claude_client is not None
+        gemini_status = pipeline().gemini_model is not None
         
         response_data = {
             'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _timestamp(),
             'python_version': sys.version.split()[0],
             'services': {
                 'flask': True,
@@ -381,5 +578,5 @@ def health():
         return jsonify({
             'status': 'error',
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _timestamp()
         }), 500
\ No newline at end of file
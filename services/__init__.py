@@ -2,8 +2,9 @@
 Services package for Australian Property Intelligence
 """
 
+from .llm_cache import LLMCache
 from .llm_service import LLMService
 from .property_service import PropertyAnalysisService
 from .stability_service import StabilityService
 
-__all__ = ['LLMService', 'PropertyAnalysisService', 'StabilityService']
\ No newline at end of file
+__all__ = ['LLMCache', 'LLMService', 'PropertyAnalysisService', 'StabilityService']
\ No newline at end of file
@@ -6,7 +6,8 @@ Analyze sentiment of property descriptions, market news, and development applica
 import requests
 import logging
 import time
-from typing import Dict, List, Optional
+import numpy as np
+from typing import Dict, List, Optional, Union
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -100,37 +101,50 @@ class HuggingFaceService:
             return self._error_response(f"Classification failed: {str(e)}")
     
     def analyze_market_news_sentiment(self, news_articles: List[str]) -> Dict:
-        """Analyze sentiment of multiple property news articles"""
+        """Analyze sentiment of multiple property news articles in one batched request"""
         if not self.enabled:
             return self._error_response("Hugging Face service not enabled")
         
         try:
             results = []
             overall_sentiment_scores = []
+            batch_data = []
             
-            for article in news_articles:
-                # Analyze each article
-                sentiment_result = self.analyze_property_sentiment(article)
+            if news_articles:
+                # Send every article in a single POST - HF returns one result list per input
+                response = self._query_model(
+                    news_articles,
+                    self.models['sentiment'],
+                    'sentiment-analysis'
+                )
                 
-                if sentiment_result['success']:
-                    results.append({
-                        'text': article[:200] + "..." if len(article) > 200 else article,
-                        'sentiment': sentiment_result['sentiment'],
-                        'confidence': sentiment_result['confidence'],
-                        'interpretation': sentiment_result['property_interpretation']
-                    })
-                    
-                    # Add to overall sentiment calculation
-                    sentiment_score = sentiment_result['confidence']
-                    if sentiment_result['sentiment'] == 'negative':
-                        sentiment_score = -sentiment_score
-                    elif sentiment_result['sentiment'] == 'neutral':
-                        sentiment_score = 0
-                    
-                    overall_sentiment_scores.append(sentiment_score)
+                if not response['success']:
+                    return response
+                
+                batch_data = response['data']
+            
+            for article, sentiment_data in zip(news_articles, batch_data):
+                # Batched responses carry every label per input; keep the top-scoring one
+                if isinstance(sentiment_data, list):
+                    sentiment_data = max(sentiment_data, key=lambda item: item['score'])
+                
+                property_sentiment = self._interpret_property_sentiment(sentiment_data)
+                
+                results.append({
+                    'text': article[:200] + "..." if len(article) > 200 else article,
+                    'sentiment': property_sentiment['sentiment'],
+                    'confidence': property_sentiment['confidence'],
+                    'interpretation': property_sentiment['interpretation']
+                })
+                
+                # Add to overall sentiment calculation
+                sentiment_score = property_sentiment['confidence']
+                if property_sentiment['sentiment'] == 'negative':
+                    sentiment_score = -sentiment_score
+                elif property_sentiment['sentiment'] == 'neutral':
+                    sentiment_score = 0
                 
-                # Rate limiting
-                time.sleep(0.1)
+                overall_sentiment_scores.append(sentiment_score)
             
             # Calculate overall market sentiment
             overall_sentiment = self._calculate_overall_sentiment(overall_sentiment_scores)
@@ -184,8 +198,8 @@ class HuggingFaceService:
             logger.error(f"Development application summarization failed: {e}")
             return self._error_response(f"Summarization failed: {str(e)}")
     
-    def _query_model(self, text: str, model: str, task: str) -> Dict:
-        """Query Hugging Face model API"""
+    def _query_model(self, text: Union[str, List[str]], model: str, task: str) -> Dict:
+        """Query Hugging Face model API (accepts a single text or a batch of texts)"""
         try:
             headers = {
                 'Authorization': f'Bearer {self.api_key}',
@@ -295,7 +309,9 @@ class HuggingFaceService:
         if not scores:
             return {'sentiment': 'neutral', 'confidence': 0.0, 'interpretation': 'No data'}
         
-        avg_score = sum(scores) / len(scores)
+        # Vectorised reduction - scales to thousands of articles without a Python loop
+        score_array = np.asarray(scores, dtype=np.float64)
+        avg_score = float(score_array.mean())
         
         if avg_score > 0.2:
             sentiment = 'positive'
@@ -311,7 +327,7 @@ class HuggingFaceService:
             'sentiment': sentiment,
             'confidence': abs(avg_score),
             'interpretation': interpretation,
-            'sample_size': len(scores)
+            'sample_size': int(score_array.size)
         }
     
     def _error_response(self, error_msg: str) -> Dict:
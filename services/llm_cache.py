@@ -0,0 +1,148 @@
+"""
+Caches for LLM responses
+Exact-match entries are keyed by a hash of model and prompt; semantic entries
+match questions by embedding similarity. Both persist in the property database
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import orjson
+from cachetools import TTLCache
+
+from database import LLM_CACHE_TTL_SECONDS, PropertyDatabase
+
+logger = logging.getLogger(__name__)
+
+# How long a cached LLM response is served; shared with PropertyDatabase.cache_set so both callers expire alike
+DEFAULT_TTL_SECONDS = LLM_CACHE_TTL_SECONDS
+
+# Cosine similarity above which two questions are treated as the same question
+SEMANTIC_SIMILARITY_THRESHOLD = 0.92
+MAX_SEMANTIC_ENTRIES = 1000
+
+class LLMCache:
+    """Response cache for deterministic LLM calls, backed by PropertyDatabase"""
+    
+    def __init__(self, db: PropertyDatabase):
+        self.db = db
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Build the cache key for a model and prompt"""
+        # orjson emits the sorted payload as bytes, so it is hashed without a str round trip
+        payload = orjson.dumps({'model': model, 'prompt': prompt}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss"""
+        value = self.db.get_cached_response(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+    
+    def set(self, key: str, value: str, ttl: float = DEFAULT_TTL_SECONDS):
+        """Store a response for ttl seconds"""
+        self.db.set_cached_response(key, value, ttl)
+    
+    def stats(self) -> Dict:
+        """Get hit and miss counts for this process"""
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 1) if total else 0
+            }
+
+class SemanticCache:
+    """Approximate-match cache returning the response of the most similar earlier question"""
+    
+    def __init__(self, db: PropertyDatabase, embed: Optional[Callable[[str], List[float]]],
+                 threshold: float = SEMANTIC_SIMILARITY_THRESHOLD):
+        self.db = db
+        self.threshold = threshold
+        self._embed = embed
+        self._embeddings = TTLCache(maxsize=256, ttl=DEFAULT_TTL_SECONDS)
+        # Per namespace: matrix of unit-length embeddings (one row per entry) and the matching responses
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether an embedder is configured"""
+        return self._embed is not None
+    
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed text as a unit vector, or None if no embedder is available"""
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            vector = self._embeddings.get(text)
+        if vector is not None:
+            return vector
+        
+        try:
+            vector = np.asarray(self._embed(text), dtype=np.float32)
+        except Exception as e:
+            logger.error(f"Embedding failed: {str(e)}")
+            return None
+        
+        vector /= np.linalg.norm(vector) or 1.0
+        with self._lock:
+            self._embeddings[text] = vector
+        return vector
+    
+    def _load(self, namespace: str):
+        """Load a namespace's stored entries on first use; caller holds the lock"""
+        if namespace not in self._entries:
+            rows = self.db.get_semantic_entries(namespace, MAX_SEMANTIC_ENTRIES)
+            vectors = [np.frombuffer(embedding, dtype=np.float32) for embedding, _ in rows]
+            self._entries[namespace] = (
+                np.vstack(vectors) if vectors else None,
+                [response for _, response in rows]
+            )
+        return self._entries[namespace]
+    
+    def lookup(self, namespace: str, embedding: Optional[np.ndarray]) -> Optional[str]:
+        """Get the response of the closest stored question, if it is similar enough"""
+        if embedding is None:
+            return None
+        
+        with self._lock:
+            matrix, responses = self._load(namespace)
+            if matrix is None or matrix.shape[1] != embedding.shape[0]:
+                return None
+            # Rows are unit vectors, so the dot product is the cosine similarity
+            similarities = matrix @ embedding
+        
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            logger.info(f"Semantic cache hit in {namespace} (similarity {similarities[best]:.3f})")
+            return responses[best]
+        return None
+    
+    def store(self, namespace: str, embedding: Optional[np.ndarray], response: str):
+        """Remember a response for a question embedding"""
+        if embedding is None:
+            return
+        
+        with self._lock:
+            matrix, responses = self._load(namespace)
+            if matrix is not None and matrix.shape[1] != embedding.shape[0]:
+                return
+            # Newest entries first, matching the order they are loaded from the database
+            matrix = embedding[np.newaxis, :] if matrix is None else np.vstack((embedding, matrix))[:MAX_SEMANTIC_ENTRIES]
+            self._entries[namespace] = (matrix, ([response] + responses)[:MAX_SEMANTIC_ENTRIES])
+        
+        self.db.store_semantic_entry(namespace, embedding.tobytes(), response)
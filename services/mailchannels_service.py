@@ -3,14 +3,251 @@ MailChannels Service for Property Notifications
 Send email notifications for property trends, alerts, and updates
 """
 
-import requests
+import asyncio
+import atexit
+import functools
+import jinja2
 import logging
-from typing import Dict, List, Optional
+import random
+import threading
+import time
+import orjson
+from concurrent.futures import Future, as_completed
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP client settings for MailChannels sends
+MAILCHANNELS_TIMEOUT = 30
+MAILCHANNELS_MAX_CONCURRENCY = 50 # In-flight sends per bulk batch, matching the connection pool size
+MAILCHANNELS_KEEPALIVE_SECONDS = 60
+MAILCHANNELS_QUEUE_SIZE = 10000 # Queued notifications before enqueue waits for room
+MAILCHANNELS_QUEUE_WORKERS = 8
+
+# Sends are not idempotent, so only answers that guarantee the message was not accepted
+# (rate limited, unavailable) are retried, with jittered exponential backoff; after enough
+# consecutive failures the circuit breaker fails sends fast until the cooldown passes
+MAILCHANNELS_RETRY_STATUSES = frozenset({429, 503})
+MAILCHANNELS_MAX_ATTEMPTS = 5
+MAILCHANNELS_BACKOFF_SECONDS = 0.3
+MAILCHANNELS_MAX_BACKOFF_SECONDS = 10
+MAILCHANNELS_BREAKER_THRESHOLD = 10
+MAILCHANNELS_BREAKER_COOLDOWN_SECONDS = 60
+
+# Notification subjects and bodies, compiled once; HTML templates are autoescaped, the others are not.
+# HTML bodies share the page chrome through the _header/_footer partials
+_TEMPLATE_SOURCES = {
+    '_header.html': """
+<html>
+<body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
+    <div style="max-width: 600px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px;">
+""",
+    '_footer.html': """
+        <div style="text-align: center; margin: 30px 0;">
+            <p style="color: #7F8C8D; font-size: 14px;">
+                Brisbane Property Intelligence | {{ tagline }}
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+""",
+    'trend_alert.subject': "Brisbane Property Trend Alert - {{ suburb|default('Market Update') }}",
+    'weekly_summary.subject': "Brisbane Property Weekly Summary - {{ week_ending|default('Market Update') }}",
+    'development_alert.subject': "New Development Alert - {{ suburb|default('Brisbane') }}",
+    'system_update.subject': "Brisbane Property Intelligence - {{ update_type|default('System Update') }}",
+    'trend_alert.html': """
+{% set tagline = 'Powered by AI Analysis' %}
+{% include '_header.html' %}
+        <h1 style="color: #2C3E50; text-align: center;">🏢 Brisbane Property Trend Alert</h1>
+        
+        <div style="background: #ECF0F1; padding: 15px; border-radius: 5px; margin: 20px 0;">
+            <h2 style="color: #34495E; margin: 0;">{{ trend_direction|default('stable')|arrow }} {{ suburb|default('Brisbane') }} Market Update</h2>
+            <p style="font-size: 18px; margin: 10px 0;">
+                Development activity has <strong>{{ trend_direction|default('stable') }}</strong> by <strong>{{ percentage_change|default(0) }}%</strong>
+            </p>
+        </div>
+        
+        <div style="margin: 20px 0;">
+            <h3 style="color: #2C3E50;">Key Insights:</h3>
+            <ul style="line-height: 1.6;">
+                <li>Current period: {{ current_period_count|default('N/A') }} applications</li>
+                <li>Previous period: {{ previous_period_count|default('N/A') }} applications</li>
+                <li>Confidence level: {{ confidence_score|default(0)|percent }}</li>
+            </ul>
+        </div>
+{% include '_footer.html' %}
+""",
+    'trend_alert.txt': """
+BRISBANE PROPERTY TREND ALERT
+
+{{ suburb|default('Brisbane') }} Market Update
+Development activity has {{ trend_direction|default('stable') }} by {{ percentage_change|default(0) }}%
+
+Key Insights:
+- Current period: {{ current_period_count|default('N/A') }} applications
+- Previous period: {{ previous_period_count|default('N/A') }} applications
+- Confidence level: {{ confidence_score|default(0)|percent }}
+
+Brisbane Property Intelligence | Powered by AI Analysis
+""",
+    'weekly_summary.html': """
+{% set tagline = 'Weekly Market Analysis' %}
+{% include '_header.html' %}
+        <h1 style="color: #2C3E50; text-align: center;">📊 Weekly Property Summary</h1>
+        
+        <div style="background: #ECF0F1; padding: 15px; border-radius: 5px; margin: 20px 0;">
+            <h2 style="color: #34495E; margin: 0;">Week Ending: {{ week_ending|default('N/A') }}</h2>
+        </div>
+        
+        <div style="margin: 20px 0;">
+            <h3 style="color: #2C3E50;">This Week's Highlights:</h3>
+            <ul style="line-height: 1.6;">
+                <li>Total applications: {{ total_applications|default('N/A') }}</li>
+                <li>Most active suburb: {{ most_active_suburb|default('N/A') }}</li>
+                <li>Week-over-week change: {{ week_change|default('N/A') }}%</li>
+            </ul>
+        </div>
+{% include '_footer.html' %}
+""",
+    'weekly_summary.txt': """
+BRISBANE PROPERTY WEEKLY SUMMARY
+
+Week Ending: {{ week_ending|default('N/A') }}
+
+This Week's Highlights:
+- Total applications: {{ total_applications|default('N/A') }}
+- Most active suburb: {{ most_active_suburb|default('N/A') }}
+- Week-over-week change: {{ week_change|default('N/A') }}%
+
+Brisbane Property Intelligence | Weekly Market Analysis
+""",
+    'development_alert.html': """
+{% set tagline = 'Development Monitoring' %}
+{% include '_header.html' %}
+        <h1 style="color: #2C3E50; text-align: center;">🏗️ New Development Alert</h1>
+        
+        <div style="background: #ECF0F1; padding: 15px; border-radius: 5px; margin: 20px 0;">
+            <h2 style="color: #34495E; margin: 0;">{{ suburb|default('Brisbane') }}</h2>
+            <p style="font-size: 16px; margin: 10px 0;">
+                <strong>{{ application_type|default('Development Application') }}</strong>
+            </p>
+        </div>
+        
+        <div style="margin: 20px 0;">
+            <h3 style="color: #2C3E50;">Application Details:</h3>
+            <ul style="line-height: 1.6;">
+                <li>Address: {{ address|default('N/A') }}</li>
+                <li>Description: {{ description|default('N/A') }}</li>
+                <li>Date lodged: {{ date_lodged|default('N/A') }}</li>
+            </ul>
+        </div>
+{% include '_footer.html' %}
+""",
+    'development_alert.txt': """
+NEW DEVELOPMENT ALERT
+
+{{ suburb|default('Brisbane') }}
+{{ application_type|default('Development Application') }}
+
+Application Details:
+- Address: {{ address|default('N/A') }}
+- Description: {{ description|default('N/A') }}
+- Date lodged: {{ date_lodged|default('N/A') }}
+
+Brisbane Property Intelligence | Development Monitoring
+""",
+    'system_update.html': """
+{% set tagline = 'System Notifications' %}
+{% include '_header.html' %}
+        <h1 style="color: #2C3E50; text-align: center;">🔧 System Update</h1>
+        
+        <div style="background: #ECF0F1; padding: 15px; border-radius: 5px; margin: 20px 0;">
+            <h2 style="color: #34495E; margin: 0;">{{ update_type|default('System Update') }}</h2>
+        </div>
+        
+        <div style="margin: 20px 0;">
+            <p style="line-height: 1.6;">{{ message|default('System has been updated.') }}</p>
+        </div>
+{% include '_footer.html' %}
+""",
+    'system_update.txt': """
+SYSTEM UPDATE
+
+{{ update_type|default('System Update') }}
+
+{{ message|default('System has been updated.') }}
+
+Brisbane Property Intelligence | System Notifications
+"""
+}
+
+_TREND_ARROWS = {'up': "📈", 'down': "📉"}
+
+def _arrow_filter(trend_direction: str) -> str:
+    """Arrow emoji for a trend direction"""
+    return _TREND_ARROWS.get(trend_direction, "➡️")
+
+def _percent_filter(value: float) -> str:
+    """Format a fraction as a one-decimal percentage"""
+    return f"{value:.1%}"
+
+# Compiled template bytecode is kept on disk so restarted workers skip parsing and compiling
+_BYTECODE_CACHE = jinja2.FileSystemBytecodeCache(pattern='mailchannels_%s.cache')
+
+_ENV = jinja2.Environment(
+    loader=jinja2.DictLoader(_TEMPLATE_SOURCES),
+    bytecode_cache=_BYTECODE_CACHE,
+    autoescape=jinja2.select_autoescape(enabled_extensions=('html',), default_for_string=False),
+    auto_reload=False,
+    cache_size=-1
+)
+_ENV.filters['arrow'] = _arrow_filter
+_ENV.filters['percent'] = _percent_filter
+
+def precompile_templates() -> int:
+    """Compile every notification template into the bytecode cache, returning how many were compiled"""
+    for name in _TEMPLATE_SOURCES:
+        _ENV.get_template(name)
+    return len(_TEMPLATE_SOURCES)
+
+# Notification registry: log label, result key for the caller's data, and the data fields the
+# subject and templates read (only these form the render cache key)
+_NOTIFICATIONS = {
+    'trend_alert': {
+        'label': 'Trend alert',
+        'data_key': 'trend_data',
+        'fields': ('suburb', 'percentage_change', 'trend_direction', 'current_period_count', 'previous_period_count', 'confidence_score')
+    },
+    'weekly_summary': {
+        'label': 'Weekly summary',
+        'data_key': 'summary_data',
+        'fields': ('week_ending', 'total_applications', 'most_active_suburb', 'week_change')
+    },
+    'development_alert': {
+        'label': 'Development alert',
+        'data_key': 'development_data',
+        'fields': ('suburb', 'application_type', 'address', 'description', 'date_lodged')
+    },
+    'system_update': {
+        'label': 'System update',
+        'data_key': 'update_data',
+        'fields': ('update_type', 'message')
+    }
+}
+
+@functools.lru_cache(maxsize=256)
+def _render_cached(notification_type: str, payload_key: tuple) -> Tuple[str, str, str]:
+    """Render the subject, HTML and text bodies for one notification payload, memoized"""
+    data = dict(payload_key)
+    return (
+        _ENV.get_template(f'{notification_type}.subject').render(data),
+        _ENV.get_template(f'{notification_type}.html').render(data),
+        _ENV.get_template(f'{notification_type}.txt').render(data)
+    )
+
 class MailChannelsService:
     """Service for sending property-related email notifications"""
     
@@ -22,35 +259,56 @@ class MailChannelsService:
         self.notification_types = Config.MAILCHANNELS_CONFIG['notification_types']
         self.enabled = Config.MAILCHANNELS_ENABLED and bool(self.api_key)
         
+        # Request headers and sender are the same for every send, so they are built once
+        self._headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+        self._from = {
+            'email': self.from_email,
+            'name': self.from_name
+        }
+        
+        # Sends run on one long-lived background event loop so a single pooled client keeps its
+        # keep-alive connections across requests; httpx clients belong to the loop that made them
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._client = None
+        
+        # Circuit breaker state, only touched on the background loop
+        self._consecutive_failures = 0
+        self._breaker_opened_at = 0.0
+        # Half-open: token of the single trial send let through after the cooldown, 0 when none is in flight
+        self._breaker_trial = 0
+        self._breaker_trial_count = 0
+        
+        # Background send queue drained by worker tasks on the same loop, started on first use
+        self._queue = None
+        self._workers = []
+        
         if not self.enabled:
             logger.warning("MailChannels service disabled - API key not configured")
     
-    def send_trend_alert(self, recipient: str, trend_data: Dict) -> Dict:
-        """Send property trend alert email"""
+    async def send(self, notification_type: str, recipient: str, data: Dict) -> Dict:
+        """Send one notification of any registered type"""
         if not self.enabled:
             return self._error_response("MailChannels service not enabled")
         
+        notification = _NOTIFICATIONS.get(notification_type)
+        if notification is None:
+            return self._error_response(f"Unknown notification type: {notification_type}")
+        
         try:
-            # Create trend alert content
-            subject = f"Brisbane Property Trend Alert - {trend_data.get('suburb', 'Market Update')}"
-            html_content = self._create_trend_alert_html(trend_data)
-            text_content = self._create_trend_alert_text(trend_data)
-            
-            # Send email
-            response = self._send_email(
-                recipient,
-                subject,
-                html_content,
-                text_content
-            )
+            subject, html_content, text_content = self._build_content(notification_type, data)
+            response = await self._send_email(recipient, subject, html_content, text_content)
             
             if response['success']:
                 return {
                     'success': True,
-                    'notification_type': 'trend_alert',
+                    'notification_type': notification_type,
                     'recipient': recipient,
                     'subject': subject,
-                    'trend_data': trend_data,
+                    notification['data_key']: data,
                     'sent_at': datetime.now().isoformat(),
                     'provider': 'mailchannels'
                 }
@@ -58,135 +316,264 @@ class MailChannelsService:
                 return response
                 
         except Exception as e:
-            logger.error(f"Trend alert email failed: {e}")
-            return self._error_response(f"Trend alert failed: {str(e)}")
+            logger.error(f"{notification['label']} email failed: {e}")
+            return self._error_response(f"{notification['label']} failed: {str(e)}")
+    
+    async def send_trend_alert(self, recipient: str, trend_data: Dict) -> Dict:
+        """Send property trend alert email"""
+        return await self.send('trend_alert', recipient, trend_data)
     
-    def send_weekly_summary(self, recipient: str, summary_data: Dict) -> Dict:
+    async def send_weekly_summary(self, recipient: str, summary_data: Dict) -> Dict:
         """Send weekly property market summary"""
+        return await self.send('weekly_summary', recipient, summary_data)
+    
+    async def send_development_alert(self, recipient: str, development_data: Dict) -> Dict:
+        """Send new development application alert"""
+        return await self.send('development_alert', recipient, development_data)
+    
+    async def send_system_update(self, recipient: str, update_data: Dict) -> Dict:
+        """Send system update notification"""
+        return await self.send('system_update', recipient, update_data)
+    
+    async def send_bulk(self, notification_type: str, recipients: List[str], data: Dict) -> List[Dict]:
+        """Send the same notification to many recipients concurrently, one result per recipient"""
         if not self.enabled:
-            return self._error_response("MailChannels service not enabled")
+            return [self._error_response("MailChannels service not enabled") for _ in recipients]
         
         try:
-            # Create weekly summary content
-            subject = f"Brisbane Property Weekly Summary - {summary_data.get('week_ending', 'Market Update')}"
-            html_content = self._create_weekly_summary_html(summary_data)
-            text_content = self._create_weekly_summary_text(summary_data)
-            
-            # Send email
-            response = self._send_email(
-                recipient,
-                subject,
-                html_content,
-                text_content
-            )
-            
-            if response['success']:
-                return {
-                    'success': True,
-                    'notification_type': 'weekly_summary',
-                    'recipient': recipient,
+            # Content is identical for every recipient, so it is built once
+            subject, html_content, text_content = self._build_content(notification_type, data)
+        except Exception as e:
+            logger.error(f"Bulk {notification_type} email failed: {e}")
+            return [self._error_response(f"Bulk send failed: {str(e)}") for _ in recipients]
+        
+        semaphore = asyncio.Semaphore(MAILCHANNELS_MAX_CONCURRENCY)
+        
+        async def send_one(recipient: str) -> Dict:
+            async with semaphore:
+                return await self._send_email(recipient, subject, html_content, text_content)
+        
+        results = await asyncio.gather(*(send_one(recipient) for recipient in recipients), return_exceptions=True)
+        
+        # One timestamp covers the whole batch
+        sent_at = datetime.now().isoformat()
+        bulk_results = []
+        for result in results:
+            if isinstance(result, BaseException):
+                bulk_results.append(self._error_response(f"Send failed: {str(result)}"))
+            elif result['success']:
+                bulk_results.append({
+                    **result,
+                    'notification_type': notification_type,
                     'subject': subject,
-                    'summary_data': summary_data,
-                    'sent_at': datetime.now().isoformat(),
+                    'sent_at': sent_at,
                     'provider': 'mailchannels'
-                }
+                })
             else:
-                return response
-                
-        except Exception as e:
-            logger.error(f"Weekly summary email failed: {e}")
-            return self._error_response(f"Weekly summary failed: {str(e)}")
+                bulk_results.append(result)
+        return bulk_results
     
-    def send_development_alert(self, recipient: str, development_data: Dict) -> Dict:
-        """Send new development application alert"""
-        if not self.enabled:
-            return self._error_response("MailChannels service not enabled")
+    def submit_trend_alert(self, recipient: str, trend_data: Dict) -> Future:
+        """Queue a trend alert from synchronous code; the returned future resolves to its result"""
+        return self._submit(self.send_trend_alert(recipient, trend_data))
+    
+    def submit_weekly_summary(self, recipient: str, summary_data: Dict) -> Future:
+        """Queue a weekly summary from synchronous code; the returned future resolves to its result"""
+        return self._submit(self.send_weekly_summary(recipient, summary_data))
+    
+    def submit_development_alert(self, recipient: str, development_data: Dict) -> Future:
+        """Queue a development alert from synchronous code; the returned future resolves to its result"""
+        return self._submit(self.send_development_alert(recipient, development_data))
+    
+    def submit_system_update(self, recipient: str, update_data: Dict) -> Future:
+        """Queue a system update from synchronous code; the returned future resolves to its result"""
+        return self._submit(self.send_system_update(recipient, update_data))
+    
+    def send_many(self, jobs: List[Tuple[str, str, Dict]]) -> List[Dict]:
+        """Send (notification_type, recipient, data) jobs concurrently from synchronous code, results in job order"""
+        results = [None] * len(jobs)
+        futures = {
+            self._submit(self.send(notification_type, recipient, data)): index
+            for index, (notification_type, recipient, data) in enumerate(jobs)
+        }
+        
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = self._error_response(f"Send failed: {str(e)}")
+        
+        return results
+    
+    def _submit(self, coro) -> Future:
+        """Schedule a coroutine on the background loop"""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+    
+    def _build_content(self, notification_type: str, data: Dict) -> Tuple[str, str, str]:
+        """Build the subject, HTML and text bodies for a notification type"""
+        notification = _NOTIFICATIONS.get(notification_type)
+        if notification is None:
+            raise ValueError(f"Unknown notification type: {notification_type}")
         
+        payload_key = tuple((field, data[field]) for field in notification['fields'] if field in data)
         try:
-            # Create development alert content
-            subject = f"New Development Alert - {development_data.get('suburb', 'Brisbane')}"
-            html_content = self._create_development_alert_html(development_data)
-            text_content = self._create_development_alert_text(development_data)
-            
-            # Send email
-            response = self._send_email(
-                recipient,
-                subject,
-                html_content,
-                text_content
+            return _render_cached(notification_type, payload_key)
+        except TypeError:
+            # Unhashable field values cannot be memoized, so render them directly
+            return _render_cached.__wrapped__(notification_type, payload_key)
+    
+    def clear_template_cache(self):
+        """Drop memoized notification renders"""
+        _render_cached.cache_clear()
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop that owns the HTTP client, once"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='mailchannels', daemon=True).start()
+                atexit.register(self.close)
+            return self._loop
+    
+    def _get_client(self):
+        """Return the pooled client, creating it on first use; only called on the background loop"""
+        if self._client is None:
+            # Imported here so installs with MailChannels disabled never load the HTTP stack
+            import httpx
+            limits = httpx.Limits(
+                max_connections=MAILCHANNELS_MAX_CONCURRENCY,
+                max_keepalive_connections=MAILCHANNELS_MAX_CONCURRENCY,
+                keepalive_expiry=MAILCHANNELS_KEEPALIVE_SECONDS
             )
-            
-            if response['success']:
-                return {
-                    'success': True,
-                    'notification_type': 'development_alert',
-                    'recipient': recipient,
-                    'subject': subject,
-                    'development_data': development_data,
-                    'sent_at': datetime.now().isoformat(),
-                    'provider': 'mailchannels'
-                }
-            else:
-                return response
-                
-        except Exception as e:
-            logger.error(f"Development alert email failed: {e}")
-            return self._error_response(f"Development alert failed: {str(e)}")
+            self._client = httpx.AsyncClient(
+                timeout=MAILCHANNELS_TIMEOUT,
+                transport=httpx.AsyncHTTPTransport(retries=2, limits=limits)
+            )
+        return self._client
     
-    def send_system_update(self, recipient: str, update_data: Dict) -> Dict:
-        """Send system update notification"""
+    def start(self):
+        """Start the background send queue and its worker tasks, once; blocks, so call it from sync code"""
+        asyncio.run_coroutine_threadsafe(self._start_workers(), self._get_loop()).result()
+    
+    async def _start_workers(self):
+        """Create the queue and worker tasks on the background loop, once"""
+        # Only the background loop runs this, and nothing is awaited before the check, so it cannot race
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=MAILCHANNELS_QUEUE_SIZE)
+        worker_count = Config.MAILCHANNELS_CONFIG.get('workers', MAILCHANNELS_QUEUE_WORKERS)
+        self._workers = [asyncio.create_task(self._queue_worker()) for _ in range(worker_count)]
+    
+    async def _queue_worker(self):
+        """Send queued notifications until cancelled"""
+        while True:
+            job = await self._queue.get()
+            try:
+                result = await self._post_email(**job)
+                if not result['success']:
+                    logger.error(f"Queued email to {job['recipient']} failed: {result['error']}")
+            except Exception as e:
+                logger.error(f"Queued email to {job['recipient']} failed: {e}")
+            finally:
+                self._queue.task_done()
+    
+    async def _put_job(self, job: Dict):
+        """Queue a job on the background loop, starting the workers on first use"""
+        await self._start_workers()
+        await self._queue.put(job)
+    
+    async def _stop_workers(self):
+        """Wait for queued notifications to be sent, then stop the workers"""
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._queue = None
+    
+    async def enqueue(self, notification_type: str, recipient: str, data: Dict) -> Dict:
+        """Queue a notification for background sending and return without waiting for the API"""
         if not self.enabled:
             return self._error_response("MailChannels service not enabled")
         
         try:
-            # Create system update content
-            subject = f"Brisbane Property Intelligence - {update_data.get('update_type', 'System Update')}"
-            html_content = self._create_system_update_html(update_data)
-            text_content = self._create_system_update_text(update_data)
+            subject, html_content, text_content = self._build_content(notification_type, data)
+            job = {
+                'recipient': recipient,
+                'subject': subject,
+                'html_content': html_content,
+                'text_content': text_content
+            }
+            loop = self._get_loop()
+            if asyncio.get_running_loop() is loop:
+                await self._put_job(job)
+            else:
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._put_job(job), loop))
             
-            # Send email
-            response = self._send_email(
-                recipient,
-                subject,
-                html_content,
-                text_content
-            )
+            return {
+                'success': True,
+                'queued': True,
+                'notification_type': notification_type,
+                'recipient': recipient,
+                'subject': subject,
+                'provider': 'mailchannels'
+            }
             
-            if response['success']:
-                return {
-                    'success': True,
-                    'notification_type': 'system_update',
-                    'recipient': recipient,
-                    'subject': subject,
-                    'update_data': update_data,
-                    'sent_at': datetime.now().isoformat(),
-                    'provider': 'mailchannels'
-                }
-            else:
-                return response
-                
         except Exception as e:
-            logger.error(f"System update email failed: {e}")
-            return self._error_response(f"System update failed: {str(e)}")
+            logger.error(f"Queueing {notification_type} email failed: {e}")
+            return self._error_response(f"Queueing failed: {str(e)}")
+    
+    async def enqueue_trend_alert(self, recipient: str, trend_data: Dict) -> Dict:
+        """Queue a trend alert for background sending"""
+        return await self.enqueue('trend_alert', recipient, trend_data)
+    
+    async def enqueue_weekly_summary(self, recipient: str, summary_data: Dict) -> Dict:
+        """Queue a weekly summary for background sending"""
+        return await self.enqueue('weekly_summary', recipient, summary_data)
     
-    def _send_email(self, recipient: str, subject: str, html_content: str, text_content: str) -> Dict:
-        """Send email using MailChannels API"""
+    async def enqueue_development_alert(self, recipient: str, development_data: Dict) -> Dict:
+        """Queue a development alert for background sending"""
+        return await self.enqueue('development_alert', recipient, development_data)
+    
+    async def enqueue_system_update(self, recipient: str, update_data: Dict) -> Dict:
+        """Queue a system update for background sending"""
+        return await self.enqueue('system_update', recipient, update_data)
+    
+    def close(self):
+        """Flush queued notifications, close the pooled HTTP client and stop the background loop on shutdown"""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        
+        if self._queue is not None:
+            asyncio.run_coroutine_threadsafe(self._stop_workers(), loop).result()
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result()
+            self._client = None
+        loop.call_soon_threadsafe(loop.stop)
+    
+    async def _send_email(self, recipient: str, subject: str, html_content: str, text_content: str) -> Dict:
+        """Send email using MailChannels API on the background loop"""
+        future = asyncio.run_coroutine_threadsafe(
+            self._post_email(recipient, subject, html_content, text_content),
+            self._get_loop()
+        )
+        return await asyncio.wrap_future(future)
+    
+    async def _post_email(self, recipient: str, subject: str, html_content: str, text_content: str) -> Dict:
+        """Post one email to the MailChannels API, retrying rate limits, unavailability and failed connects with backoff"""
+        breaker_token = self._breaker_admit()
+        if breaker_token is None:
+            return self._error_response("MailChannels temporarily unavailable after repeated failures")
+        
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-            
             payload = {
                 'personalizations': [
                     {
                         'to': [{'email': recipient}]
                     }
                 ],
-                'from': {
-                    'email': self.from_email,
-                    'name': self.from_name
-                },
+                'from': self._from,
                 'subject': subject,
                 'content': [
                     {
@@ -199,13 +586,32 @@ class MailChannelsService:
                     }
                 ]
             }
+            body = orjson.dumps(payload)
             
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            client = self._get_client()
+            import httpx # Already loaded by _get_client; provides the retryable connect error types
+            for attempt in range(1, MAILCHANNELS_MAX_ATTEMPTS + 1):
+                retry_after = None
+                try:
+                    response = await client.post(
+                        self.api_url,
+                        headers=self._headers,
+                        content=body
+                    )
+                except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                    # The request never reached MailChannels; any later failure may follow delivery
+                    if attempt == MAILCHANNELS_MAX_ATTEMPTS:
+                        raise
+                    logger.warning(f"MailChannels send attempt {attempt} failed: {e}")
+                else:
+                    if response.status_code not in MAILCHANNELS_RETRY_STATUSES or attempt == MAILCHANNELS_MAX_ATTEMPTS:
+                        break
+                    retry_after = response.headers.get('Retry-After')
+                    logger.warning(f"MailChannels send attempt {attempt} got {response.status_code}, retrying")
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+            
+            # Only rate limits and server errors say anything about MailChannels' health
+            self._record_send_outcome(response.status_code != 429 and response.status_code < 500, breaker_token)
             
             if response.status_code == 202:
                 return {
@@ -218,202 +624,48 @@ class MailChannelsService:
                 return self._error_response(f"API error: {response.status_code}")
                 
         except Exception as e:
+            self._record_send_outcome(False, breaker_token)
             logger.error(f"MailChannels send failed: {e}")
             return self._error_response(f"Send failed: {str(e)}")
     
-    def _create_trend_alert_html(self, trend_data: Dict) -> str:
-        """Create HTML content for trend alert"""
-        suburb = trend_data.get('suburb', 'Brisbane')
-        change = trend_data.get('percentage_change', 0)
-        trend_direction = trend_data.get('trend_direction', 'stable')
-        
-        arrow = "📈" if trend_direction == 'up' else "📉" if trend_direction == 'down' else "➡️"
-        
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
-            <div style="max-width: 600px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px;">
-                <h1 style="color: #2C3E50; text-align: center;">🏢 Brisbane Property Trend Alert</h1>
-                
-                <div style="background: #ECF0F1; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <h2 style="color: #34495E; margin: 0;">{arrow} {suburb} Market Update</h2>
-                    <p style="font-size: 18px; margin: 10px 0;">
-                        Development activity has <strong>{trend_direction}</strong> by <strong>{change}%</strong>
-                    </p>
-                </div>
-                
-                <div style="margin: 20px 0;">
-                    <h3 style="color: #2C3E50;">Key Insights:</h3>
-                    <ul style="line-height: 1.6;">
-                        <li>Current period: {trend_data.get('current_period_count', 'N/A')} applications</li>
-                        <li>Previous period: {trend_data.get('previous_period_count', 'N/A')} applications</li>
-                        <li>Confidence level: {trend_data.get('confidence_score', 0):.1%}</li>
-                    </ul>
-                </div>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <p style="color: #7F8C8D; font-size: 14px;">
-                        Brisbane Property Intelligence | Powered by AI Analysis
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-    
-    def _create_trend_alert_text(self, trend_data: Dict) -> str:
-        """Create text content for trend alert"""
-        suburb = trend_data.get('suburb', 'Brisbane')
-        change = trend_data.get('percentage_change', 0)
-        trend_direction = trend_data.get('trend_direction', 'stable')
-        
-        return f"""
-        BRISBANE PROPERTY TREND ALERT
-        
-        {suburb} Market Update
-        Development activity has {trend_direction} by {change}%
-        
-        Key Insights:
-        - Current period: {trend_data.get('current_period_count', 'N/A')} applications
-        - Previous period: {trend_data.get('previous_period_count', 'N/A')} applications
-        - Confidence level: {trend_data.get('confidence_score', 0):.1%}
-        
-        Brisbane Property Intelligence | Powered by AI Analysis
-        """
-    
-    def _create_weekly_summary_html(self, summary_data: Dict) -> str:
-        """Create HTML content for weekly summary"""
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
-            <div style="max-width: 600px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px;">
-                <h1 style="color: #2C3E50; text-align: center;">📊 Weekly Property Summary</h1>
-                
-                <div style="background: #ECF0F1; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <h2 style="color: #34495E; margin: 0;">Week Ending: {summary_data.get('week_ending', 'N/A')}</h2>
-                </div>
-                
-                <div style="margin: 20px 0;">
-                    <h3 style="color: #2C3E50;">This Week's Highlights:</h3>
-                    <ul style="line-height: 1.6;">
-                        <li>Total applications: {summary_data.get('total_applications', 'N/A')}</li>
-                        <li>Most active suburb: {summary_data.get('most_active_suburb', 'N/A')}</li>
-                        <li>Week-over-week change: {summary_data.get('week_change', 'N/A')}%</li>
-                    </ul>
-                </div>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <p style="color: #7F8C8D; font-size: 14px;">
-                        Brisbane Property Intelligence | Weekly Market Analysis
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-    
-    def _create_weekly_summary_text(self, summary_data: Dict) -> str:
-        """Create text content for weekly summary"""
-        return f"""
-        BRISBANE PROPERTY WEEKLY SUMMARY
-        
-        Week Ending: {summary_data.get('week_ending', 'N/A')}
-        
-        This Week's Highlights:
-        - Total applications: {summary_data.get('total_applications', 'N/A')}
-        - Most active suburb: {summary_data.get('most_active_suburb', 'N/A')}
-        - Week-over-week change: {summary_data.get('week_change', 'N/A')}%
-        
-        Brisbane Property Intelligence | Weekly Market Analysis
-        """
-    
-    def _create_development_alert_html(self, development_data: Dict) -> str:
-        """Create HTML content for development alert"""
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
-            <div style="max-width: 600px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px;">
-                <h1 style="color: #2C3E50; text-align: center;">🏗️ New Development Alert</h1>
-                
-                <div style="background: #ECF0F1; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <h2 style="color: #34495E; margin: 0;">{development_data.get('suburb', 'Brisbane')}</h2>
-                    <p style="font-size: 16px; margin: 10px 0;">
-                        <strong>{development_data.get('application_type', 'Development Application')}</strong>
-                    </p>
-                </div>
-                
-                <div style="margin: 20px 0;">
-                    <h3 style="color: #2C3E50;">Application Details:</h3>
-                    <ul style="line-height: 1.6;">
-                        <li>Address: {development_data.get('address', 'N/A')}</li>
-                        <li>Description: {development_data.get('description', 'N/A')}</li>
-                        <li>Date lodged: {development_data.get('date_lodged', 'N/A')}</li>
-                    </ul>
-                </div>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <p style="color: #7F8C8D; font-size: 14px;">
-                        Brisbane Property Intelligence | Development Monitoring
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-    
-    def _create_development_alert_text(self, development_data: Dict) -> str:
-        """Create text content for development alert"""
-        return f"""
-        NEW DEVELOPMENT ALERT
-        
-        {development_data.get('suburb', 'Brisbane')}
-        {development_data.get('application_type', 'Development Application')}
-        
-        Application Details:
-        - Address: {development_data.get('address', 'N/A')}
-        - Description: {development_data.get('description', 'N/A')}
-        - Date lodged: {development_data.get('date_lodged', 'N/A')}
-        
-        Brisbane Property Intelligence | Development Monitoring
-        """
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before the next attempt, honouring a numeric Retry-After header"""
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), MAILCHANNELS_MAX_BACKOFF_SECONDS)
+        except ValueError:
+            pass
+        backoff = min(MAILCHANNELS_BACKOFF_SECONDS * 2 ** (attempt - 1), MAILCHANNELS_MAX_BACKOFF_SECONDS)
+        return backoff + random.uniform(0, MAILCHANNELS_BACKOFF_SECONDS)
     
-    def _create_system_update_html(self, update_data: Dict) -> str:
-        """Create HTML content for system update"""
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
-            <div style="max-width: 600px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px;">
-                <h1 style="color: #2C3E50; text-align: center;">🔧 System Update</h1>
-                
-                <div style="background: #ECF0F1; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <h2 style="color: #34495E; margin: 0;">{update_data.get('update_type', 'System Update')}</h2>
-                </div>
-                
-                <div style="margin: 20px 0;">
-                    <p style="line-height: 1.6;">{update_data.get('message', 'System has been updated.')}</p>
-                </div>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <p style="color: #7F8C8D; font-size: 14px;">
-                        Brisbane Property Intelligence | System Notifications
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
+    def _breaker_admit(self) -> Optional[int]:
+        """Admit a send: None if short-circuited, else the token its outcome is reported with
+
+        After the cooldown a single trial send is let through, with a nonzero token of its own.
         """
+        if self._consecutive_failures < MAILCHANNELS_BREAKER_THRESHOLD:
+            return 0
+        if self._breaker_trial or time.monotonic() - self._breaker_opened_at < MAILCHANNELS_BREAKER_COOLDOWN_SECONDS:
+            return None
+        self._breaker_trial_count += 1
+        self._breaker_trial = self._breaker_trial_count
+        return self._breaker_trial
     
-    def _create_system_update_text(self, update_data: Dict) -> str:
-        """Create text content for system update"""
-        return f"""
-        SYSTEM UPDATE
-        
-        {update_data.get('update_type', 'System Update')}
-        
-        {update_data.get('message', 'System has been updated.')}
-        
-        Brisbane Property Intelligence | System Notifications
-        """
+    def _record_send_outcome(self, success: bool, token: int):
+        """Track consecutive failures, opening the breaker once they reach the threshold"""
+        if self._breaker_trial:
+            # Sends admitted before the breaker opened can finish late; only the trial decides half-open
+            if token != self._breaker_trial:
+                return
+            self._breaker_trial = 0
+        if success:
+            self._consecutive_failures = 0
+            return
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= MAILCHANNELS_BREAKER_THRESHOLD:
+            # After the cooldown one trial send is let through; its failure reopens the breaker
+            self._breaker_opened_at = time.monotonic()
+            logger.error(f"MailChannels circuit breaker open for {MAILCHANNELS_BREAKER_COOLDOWN_SECONDS}s")
     
     def _error_response(self, error_msg: str) -> Dict:
         """Standardized error response"""
@@ -454,4 +706,9 @@ class MailChannelsService:
             }
                 
         except Exception as e:
-            return self._error_response(f"Connection test failed: {str(e)}")
\ No newline at end of file
+            return self._error_response(f"Connection test failed: {str(e)}")
+
+if __name__ == '__main__':
+    # Run at deploy time (python -m services.mailchannels_service) so workers start with warm template bytecode
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"Precompiled {precompile_templates()} MailChannels templates")
@@ -1,7 +1,10 @@
+import functools
 import logging
 import time
 import json
 import re # Ensure this is imported
+import threading
+from cachetools import TTLCache
 
 from services.llm_service import LLMService
 from services.rss_service import RSSService
@@ -10,11 +13,116 @@ from config import Config # Ensure Config is imported for GOOGLE_CSE_TOP_N_RESUL
 
 logger = logging.getLogger(__name__)
 
+# Location keywords by scope, in priority order. Keywords match whole words only, so short codes
+# such as 'wa', 'sa' and 'nt' no longer match inside words like 'want', 'sale' or 'rent'
+_LOCATION_KEYWORDS = (
+    ('Brisbane', ('brisbane', 'queensland', 'qld', 'gold coast', 'sunshine coast')),
+    ('Sydney', ('sydney', 'nsw', 'new south wales')),
+    ('Melbourne', ('melbourne', 'victoria', 'vic')),
+    ('Perth', ('perth', 'western australia', 'wa')),
+    ('Adelaide', ('adelaide', 'south australia', 'sa')),
+    ('Darwin', ('darwin', 'northern territory', 'nt'))
+)
+_LOCATION_PRIORITY = tuple(scope for scope, _ in _LOCATION_KEYWORDS)
+
+# One named group per scope, so a single scan of the question finds every scope it mentions
+_LOCATION_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(f"(?P<{scope}>{'|'.join(keywords)})" for scope, keywords in _LOCATION_KEYWORDS) + r')\b',
+    re.IGNORECASE
+)
+
+# Prompt text is fixed apart from its slots, so it lives here rather than being rebuilt per call
+_NO_RSS_CONTEXT_NOTE = "No specific relevant RSS articles found to directly answer factual numbers."
+
+_INITIAL_PROMPT_TEMPLATE = """You are an expert Australian property market analyst.
+Your primary goal is to answer the user's question comprehensively and accurately.
+The user's question is about the {location_scope} property market.
+
+User Question: "{question}"
+
+First, assess if this question requires a specific, up-to-date factual number (e.g., an average property price, current rental yield, specific market statistic, population, recent sales volume).
+If it does, your **ACTION** must be to perform a `web_search`.
+If it does not (e.g., it's a general trend, analysis, comparison, or opinion), your **ACTION** must be `analyze_directly`.
+
+**Context provided for your decision:**
+- Location Scope: {location_scope}
+- Relevant RSS News/Trends (may contain general trends, but unlikely specific numbers):
+{rss_context}
+
+**Your response MUST be a JSON object with an "action" key.**
+
+**If "action" is "web_search":**
+- It MUST include a "query" key with a precise search query (e.g., "current median house price Darwin 3 bedroom").
+- Example:
+{{
+    "action": "web_search",
+    "query": "median house price Darwin 3 bedroom house"
+}}
+
+**If "action" is "analyze_directly":**
+- It MUST include a "reason" key explaining why no search is needed.
+- Example:
+{{
+    "action": "analyze_directly",
+    "reason": "This is a general trend question that can be answered using RSS articles and market knowledge"
+}}
+
+Respond with ONLY the JSON object, no other text."""
+
+_FINAL_PROMPT_TEMPLATE = """You are an expert Australian property market analyst providing comprehensive analysis.
+
+**User Question:** "{question}"
+**Location Focus:** {location_scope}
+
+**Available Context:**
+{rss_context}
+{search_results_context}
+
+**Instructions:**
+1. Provide a detailed, professional analysis of the property question
+2. Focus specifically on the {location_scope} market when relevant
+3. Use the provided RSS articles and search results to support your analysis
+4. Include specific data points, trends, and insights where available
+5. Structure your response clearly with key findings
+6. Provide actionable insights for property investors or buyers
+7. Be comprehensive but concise (aim for 3-4 paragraphs)
+
+**Response Format:**
+Provide a well-structured analysis that directly answers the user's question about {location_scope} property market trends, using the latest available information."""
+
+# How long a formatted RSS context section is reused across questions for the same scope
+RSS_CONTEXT_CACHE_SECONDS = 120
+
+# Context sections for the LLM prompts, each built with a single join over formatted lines
+_RSS_CONTEXT_HEADER = "\n\nRelevant RSS Articles:"
+_RSS_ARTICLE_LINE = "- Title: {title}\n  Snippet: {snippet}\n  Link: {link}"
+_SEARCH_CONTEXT_HEADER = "\n\nWeb Search Results:"
+_SEARCH_RESULT_LINE = "- Title: {title}\n  Snippet: {snippet}\n  Link: {link}"
+
+# RSS article descriptions longer than this are cut, with an ellipsis, before prompting
+RSS_SNIPPET_MAX_LENGTH = 200
+
+def _truncate(text: str, max_length: int) -> str:
+    """Shortens text to max_length with an ellipsis, leaving text that already fits untouched."""
+    return text if len(text) <= max_length else text[:max_length] + "..."
+
+@functools.lru_cache(maxsize=1024)
+def _detect_location_scope(question: str) -> str:
+    """Returns the highest-priority location scope mentioned in a question, memoized for repeated questions."""
+    mentioned = {match.lastgroup for match in _LOCATION_PATTERN.finditer(question)}
+    for scope in _LOCATION_PRIORITY:
+        if scope in mentioned:
+            return scope
+    return 'National'
+
 class PropertyAnalysisService:
     def __init__(self, llm_service: LLMService, rss_service: RSSService = None, web_search_service: WebSearchService = None):
         self.llm_service = llm_service
         self.rss_service = rss_service
         self.web_search_service = web_search_service
+        # Formatted RSS context per (scope, article limit); feeds change slowly, so bursts of questions share it
+        self._rss_context_cache = TTLCache(maxsize=16, ttl=RSS_CONTEXT_CACHE_SECONDS)
+        self._rss_context_lock = threading.Lock() # Async views run on separate threads
         logger.info(f"PropertyAnalysisService initialized with LLM: {llm_service is not None}, RSS: {rss_service is not None}, WebSearch: {web_search_service is not None}")
 
     async def analyze_property_question(self, question: str) -> dict:
@@ -37,15 +145,7 @@ class PropertyAnalysisService:
             rss_context = ""
             if self.rss_service and self.rss_service.is_available:
                 try:
-                    articles = await self.rss_service.get_relevant_articles(location_info['scope'])
-                    if articles:
-                        rss_context = "\n\nRelevant RSS Articles:\n" + "\n".join([
-                            f"- Title: {a['title']}\n  Snippet: {a['description'][:200]}...\n  Link: {a['link']}" 
-                            for a in articles[:Config.RSS_TOP_N_ARTICLES_FOR_LLM]
-                        ])
-                        logger.info(f"Retrieved {len(articles)} relevant RSS articles for {location_info['scope']}.")
-                    else:
-                        logger.info(f"No relevant RSS articles found for {location_info['scope']}.")
+                    rss_context = await self._get_rss_context(location_info['scope'])
                 except Exception as e:
                     logger.warning(f"Failed to get RSS data for analysis: {e}. Proceeding without RSS context.")
             else:
@@ -72,39 +172,38 @@ class PropertyAnalysisService:
 
             search_results_context = ""
             search_decision = self._check_for_search_necessity(initial_llm_response['answer'])
+            # Read the decided action once rather than re-checking the decision on each branch
+            search_action = search_decision.get("action") if search_decision else None
             
-            if search_decision and search_decision.get("action") == "web_search":
+            if search_action == "web_search":
                 if self.web_search_service and self.web_search_service.is_available:
                     logger.info(f"🌐 LLM determined web search is needed. Performing search for: '{search_decision['query']}'")
                     search_response = await self.web_search_service.search(search_decision['query'])
                     if search_response['success']:
-                        search_results_context = "\n\nWeb Search Results:\n" + "\n".join([
-                            f"- Title: {item.get('title')}\n  Snippet: {item.get('snippet', '')[:Config.GOOGLE_CSE_SNIPPET_MAX_LENGTH]}...\n  Link: {item.get('link')}"
+                        search_results_context = "\n".join([_SEARCH_CONTEXT_HEADER, *(
+                            _SEARCH_RESULT_LINE.format(
+                                title=item.get('title'),
+                                snippet=_truncate(item.get('snippet', ''), Config.GOOGLE_CSE_SNIPPET_MAX_LENGTH),
+                                link=item.get('link')
+                            )
                             for item in search_response['results'][:Config.GOOGLE_CSE_TOP_N_RESULTS]
-                        ])
+                        )])
                         logger.info(f"✅ Web search completed with {len(search_response['results'])} results.")
                     else:
                         logger.warning(f"⚠️ Web search failed: {search_response['error']}. Proceeding without search context.")
                 else:
                     logger.warning("⚠️ Web search determined necessary but service is unavailable. Proceeding without search context.")
-            elif search_decision and search_decision.get("action") == "analyze_directly":
+            elif search_action == "analyze_directly":
                 logger.info(f"LLM decided to analyze directly based on reason: {search_decision.get('reason', 'N/A')}")
             else:
                 logger.warning("LLM search decision could not be parsed or was invalid. Assuming direct analysis.")
 
             # 4. Final LLM Analysis with All Context
+            # Runs only after the decision: a started LLM request cannot be cancelled, so
+            # starting it speculatively would bill a second full analysis whenever a search runs
             final_llm_prompt = self._build_final_llm_prompt(question, location_info, rss_context, search_results_context)
             logger.info("🤖 Final LLM prompt sent with all gathered context.")
-
-            # Try Gemini first if available, then Claude as fallback
-            if self.llm_service.gemini_is_available:
-                llm_response = await self.llm_service.analyze_with_gemini(final_llm_prompt)
-                llm_provider = "gemini"
-            elif self.llm_service.claude_is_available:
-                llm_response = await self.llm_service.analyze_with_claude(final_llm_prompt)
-                llm_provider = "claude"
-            else:
-                raise Exception("No LLM services are available")
+            llm_provider, llm_response = await self._run_final_analysis(final_llm_prompt)
 
             # Add safety check for final response
             if not llm_response or not isinstance(llm_response, dict):
@@ -133,22 +232,41 @@ class PropertyAnalysisService:
             "gemini_result": None
         }
 
+    async def _get_rss_context(self, location_scope: str) -> str:
+        """Returns the formatted RSS articles section for a location scope, reused for a short TTL."""
+        max_articles = Config.RSS_TOP_N_ARTICLES_FOR_LLM
+        cache_key = (location_scope, max_articles)
+        with self._rss_context_lock:
+            cached = self._rss_context_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached RSS context for {location_scope}.")
+            return cached
+
+        rss_context = ""
+        articles = await self.rss_service.get_relevant_articles(location_scope, max_articles=max_articles)
+        if articles:
+            rss_context = "\n".join([_RSS_CONTEXT_HEADER, *(
+                _RSS_ARTICLE_LINE.format(title=a['title'], snippet=_truncate(a['description'], RSS_SNIPPET_MAX_LENGTH), link=a['link'])
+                for a in articles[:max_articles]
+            )])
+            logger.info(f"Retrieved {len(articles)} relevant RSS articles for {location_scope}.")
+        else:
+            logger.info(f"No relevant RSS articles found for {location_scope}.")
+
+        with self._rss_context_lock:
+            self._rss_context_cache[cache_key] = rss_context
+        return rss_context
+
+    async def _run_final_analysis(self, prompt: str) -> tuple:
+        """Runs the final analysis prompt, preferring Gemini with Claude as fallback; returns (provider, response)."""
+        if self.llm_service.gemini_is_available:
+            return "gemini", await self.llm_service.analyze_with_gemini(prompt)
+        if self.llm_service.claude_is_available:
+            return "claude", await self.llm_service.analyze_with_claude(prompt)
+        raise Exception("No LLM services are available")
+
     def _detect_location(self, question: str) -> dict:
-        location_mapping = {
-            'brisbane': {'scope': 'Brisbane', 'keywords': ['brisbane', 'queensland', 'qld', 'gold coast', 'sunshine coast']},
-            'sydney': {'scope': 'Sydney', 'keywords': ['sydney', 'nsw', 'new south wales']},
-            'melbourne': {'scope': 'Melbourne', 'keywords': ['melbourne', 'victoria', 'vic']},
-            'perth': {'scope': 'Perth', 'keywords': ['perth', 'western australia', 'wa']},
-            'adelaide': {'scope': 'Adelaide', 'keywords': ['adelaide', 'south australia', 'sa']},
-            'darwin': {'scope': 'Darwin', 'keywords': ['darwin', 'northern territory', 'nt']},
-        }
-        question_lower = question.lower()
-        detected_scope = 'National'
-        for loc, data in location_mapping.items():
-            if any(keyword in question_lower for keyword in data['keywords']):
-                detected_scope = data['scope']
-                break
-        return {'scope': detected_scope}
+        return {'scope': _detect_location_scope(question)}
 
     def _build_initial_llm_prompt(self, question: str, location_info: dict, rss_context: str) -> str:
         """
@@ -157,42 +275,11 @@ class PropertyAnalysisService:
         """
         location_scope = location_info.get('scope', 'National')
         
-        prompt = f"""You are an expert Australian property market analyst.
-Your primary goal is to answer the user's question comprehensively and accurately.
-The user's question is about the {location_scope} property market.
-
-User Question: "{question}"
-
-First, assess if this question requires a specific, up-to-date factual number (e.g., an average property price, current rental yield, specific market statistic, population, recent sales volume).
-If it does, your **ACTION** must be to perform a `web_search`.
-If it does not (e.g., it's a general trend, analysis, comparison, or opinion), your **ACTION** must be `analyze_directly`.
-
-**Context provided for your decision:**
-- Location Scope: {location_scope}
-- Relevant RSS News/Trends (may contain general trends, but unlikely specific numbers):
-{rss_context if rss_context else "No specific relevant RSS articles found to directly answer factual numbers."}
-
-**Your response MUST be a JSON object with an "action" key.**
-
-**If "action" is "web_search":**
-- It MUST include a "query" key with a precise search query (e.g., "current median house price Darwin 3 bedroom").
-- Example:
-{{
-    "action": "web_search",
-    "query": "median house price Darwin 3 bedroom house"
-}}
-
-**If "action" is "analyze_directly":**
-- It MUST include a "reason" key explaining why no search is needed.
-- Example:
-{{
-    "action": "analyze_directly",
-    "reason": "This is a general trend question that can be answered using RSS articles and market knowledge"
-}}
-
-Respond with ONLY the JSON object, no other text."""
-
-        return prompt
+        return _INITIAL_PROMPT_TEMPLATE.format(
+            location_scope=location_scope,
+            question=question,
+            rss_context=rss_context or _NO_RSS_CONTEXT_NOTE
+        )
 
     def _build_final_llm_prompt(self, question: str, location_info: dict, rss_context: str, search_results_context: str) -> str:
         """
@@ -200,28 +287,12 @@ Respond with ONLY the JSON object, no other text."""
         """
         location_scope = location_info.get('scope', 'National')
         
-        prompt = f"""You are an expert Australian property market analyst providing comprehensive analysis.
-
-**User Question:** "{question}"
-**Location Focus:** {location_scope}
-
-**Available Context:**
-{rss_context}
-{search_results_context}
-
-**Instructions:**
-1. Provide a detailed, professional analysis of the property question
-2. Focus specifically on the {location_scope} market when relevant
-3. Use the provided RSS articles and search results to support your analysis
-4. Include specific data points, trends, and insights where available
-5. Structure your response clearly with key findings
-6. Provide actionable insights for property investors or buyers
-7. Be comprehensive but concise (aim for 3-4 paragraphs)
-
-**Response Format:**
-Provide a well-structured analysis that directly answers the user's question about {location_scope} property market trends, using the latest available information."""
-
-        return prompt
+        return _FINAL_PROMPT_TEMPLATE.format(
+            location_scope=location_scope,
+            question=question,
+            rss_context=rss_context,
+            search_results_context=search_results_context
+        )
 
     def _check_for_search_necessity(self, llm_response: str) -> dict:
         """
@@ -1,20 +1,79 @@
 # services/rss_service.py (Inside your RSSService class)
 
+import asyncio
+import calendar
+import heapq
+import io
+import itertools
 import logging
-import feedparser # Assuming this is used for parsing RSS feeds
+import re
+import threading
+from collections import defaultdict
 import httpx # Assuming this is used for fetching RSS feeds
-import time
+from cachetools import TTLCache
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple
+from lxml import etree
+from urllib.parse import urlparse
 
 from config import Config # Import your Config for RSS_FEEDS
 
 logger = logging.getLogger(__name__)
 
+class FeedConfig(NamedTuple):
+    """Immutable view of one configured RSS feed."""
+    name: str
+    url: str
+    host: str
+    categories: tuple
+    locations: tuple
+
+# Built once at import; iteration paths walk the tuple instead of per-instance dicts
+_FEEDS = tuple(
+    FeedConfig(
+        name=feed['name'],
+        url=feed['url'],
+        host=urlparse(feed['url']).netloc,
+        categories=tuple(feed.get('categories', ())),
+        locations=tuple(feed.get('locations', ()))
+    )
+    for feed in Config.RSS_FEEDS
+)
+
+# Property category keywords compiled into one pattern so each article is scanned once
+PROPERTY_CATEGORIES = ["property", "real estate", "housing", "market", "investment", "home"]
+_PROPERTY_CATEGORY_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in PROPERTY_CATEGORIES))
+
+# Shared HTTP client settings for feed fetching
+RSS_REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; PropertyIntelligenceBot/3.0)'}
+RSS_CLIENT_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+MAX_CONCURRENT_REQUESTS_PER_HOST = 2 # Politeness limit; distinct hosts are fetched fully in parallel
+
+# How long the merged article list from all feeds is reused between calls
+ALL_ARTICLES_CACHE_SECONDS = 60
+
+def _rfc822_timestamp(published: str) -> float:
+    """Converts an RSS pubDate string to a POSIX timestamp, or 0.0 if unparseable."""
+    try:
+        return parsedate_to_datetime(published).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return 0.0
+
+def _published_key(article: dict) -> float:
+    """Sort key for articles by their precomputed publish timestamp."""
+    return article['_published_ts']
+
 class RSSService:
     def __init__(self):
-        self.rss_feeds = Config.RSS_FEEDS
-        self.cache = {} # Simple in-memory cache for RSS data
+        self.rss_feeds = _FEEDS
         self.cache_duration_hours = Config.RSS_CACHE_DURATION_HOURS
+        # Bounded in-memory cache for RSS data; entries expire on access after the configured TTL
+        self.cache = TTLCache(maxsize=64, ttl=self.cache_duration_hours * 3600)
+        self._cache_lock = threading.RLock() # Async views run on separate threads, so cache writes can race
+        self._all_articles_cache = TTLCache(maxsize=1, ttl=ALL_ARTICLES_CACHE_SECONDS)
+        # ETag/Last-Modified plus last parsed articles per feed, kept past cache expiry for conditional GETs
+        self._feed_validators = {}
 
         # Add is_available flag
         if not self.rss_feeds:
@@ -25,69 +84,173 @@ class RSSService:
             logger.info(f"✅ RSS Service initialized with {len(self.rss_feeds)} feeds.")
             # Optional: Test initial fetch here to confirm availability
 
-    async def _fetch_feed(self, url: str) -> list:
+    def _create_client(self) -> httpx.AsyncClient:
+        """Creates a pooled HTTP client shared by all feed fetches in one refresh."""
+        return httpx.AsyncClient(
+            timeout=10,
+            headers=RSS_REQUEST_HEADERS,
+            transport=httpx.AsyncHTTPTransport(retries=2, limits=RSS_CLIENT_LIMITS)
+        )
+
+    async def _fetch_feed(self, client: httpx.AsyncClient, url: str, host_semaphore: asyncio.Semaphore) -> list:
         """Fetches and parses a single RSS feed asynchronously."""
-        if url in self.cache and (time.time() - self.cache[url]['timestamp']) < self.cache_duration_hours * 3600:
+        with self._cache_lock:
+            cached = self.cache.get(url)
+        if cached is not None:
             logger.info(f"Using cached data for RSS feed: {url}")
-            return self.cache[url]['data']
+            return cached
+        
+        with self._cache_lock:
+            validators = self._feed_validators.get(url)
+        
+        request_headers = {}
+        if validators:
+            if validators['etag']:
+                request_headers['If-None-Match'] = validators['etag']
+            if validators['last_modified']:
+                request_headers['If-Modified-Since'] = validators['last_modified']
         
         logger.info(f"Fetching RSS feed from: {url}")
+        # Transient connection failures are retried by the client transport; only the final outcome lands here
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-            
-            feed = feedparser.parse(response.text)
-            parsed_articles = []
-            for entry in feed.entries:
-                parsed_articles.append({
-                    "title": entry.title,
-                    "link": entry.link,
-                    "description": entry.summary if hasattr(entry, 'summary') else entry.title,
-                    "published": getattr(entry, 'published', ''),
-                    "source_url": url # Keep track of original source
-                })
-            self.cache[url] = {'data': parsed_articles, 'timestamp': time.time()}
-            logger.info(f"Successfully fetched {len(parsed_articles)} articles from {url}.")
-            return parsed_articles
+            async with host_semaphore:
+                response = await client.get(url, headers=request_headers)
+            if response.status_code == 304 and validators:
+                # Feed unchanged since the last fetch; skip download and parsing
+                logger.info(f"RSS feed not modified, reusing previous articles: {url}")
+                with self._cache_lock:
+                    self.cache[url] = validators['data']
+                return validators['data']
+            # Checked after the 304 branch, since httpx treats a 304 as an error status
+            response.raise_for_status()
         except httpx.HTTPStatusError as e:
             logger.error(f"❌ HTTP error fetching RSS feed {url}: {e.response.status_code} - {e.response.text}")
+            return []
         except httpx.RequestError as e:
             logger.error(f"❌ Network error fetching RSS feed {url}: {e}")
-        except Exception as e:
+            return []
+        
+        try:
+            parsed_articles = self._parse_rss_fast(response.content, url)
+            if parsed_articles is None:
+                parsed_articles = self._parse_with_feedparser(response.content, url)
+        except (ValueError, KeyError, TypeError) as e:
             logger.error(f"❌ Error parsing RSS feed {url}: {e}")
-        return []
+            return []
+        
+        # Keep each feed newest-first so feeds can be merged without a full re-sort
+        parsed_articles.sort(key=_published_key, reverse=True)
+        with self._cache_lock:
+            self.cache[url] = parsed_articles
+            self._feed_validators[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'data': parsed_articles
+            }
+        logger.info(f"Successfully fetched {len(parsed_articles)} articles from {url}.")
+        return parsed_articles
+
+    def _parse_rss_fast(self, content: bytes, url: str) -> list:
+        """Parses RSS 2.0 <item> elements with lxml; returns None if the feed needs feedparser."""
+        parsed_articles = []
+        try:
+            for _, item in etree.iterparse(io.BytesIO(content), events=('end',), tag='item', resolve_entities=False):
+                title = (item.findtext('title') or '').strip()
+                description = (item.findtext('description') or '').strip() or title
+                published = (item.findtext('pubDate') or '').strip()
+                parsed_articles.append({
+                    "title": title,
+                    "link": (item.findtext('link') or '').strip(),
+                    "description": description,
+                    "published": published,
+                    "source_url": url, # Keep track of original source
+                    "_published_ts": _rfc822_timestamp(published), # Parsed once so sorting never re-parses dates
+                    "_search_blob": f"{title} {description}".lower() # Lowercased once for keyword filtering
+                })
+                # Release parsed items so memory stays flat on large feeds
+                item.clear()
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
+        except etree.XMLSyntaxError as e:
+            logger.warning(f"Fast RSS parse failed for {url}, falling back to feedparser: {e}")
+            return None
+        
+        # Atom and other non-RSS formats have no <item> elements
+        return parsed_articles or None
 
-    async def get_relevant_articles(self, location_scope: str = 'National') -> list:
+    def _parse_with_feedparser(self, content: bytes, url: str) -> list:
+        """Parses any feed format with feedparser."""
+        # Imported on first use; the lxml path handles plain RSS, so most workers never load feedparser
+        import feedparser
+        # Hand feedparser the raw bytes; response.text would decode a str copy that feedparser re-encodes
+        feed = feedparser.parse(content)
+        # FeedParserDict is a dict, so .get() avoids the slower __getattr__ key mapping;
+        # dict displays evaluate left to right, so title and description are bound before _search_blob
+        return [
+            {
+                "title": (title := entry.get('title', '')),
+                "link": entry.get('link', ''),
+                "description": (description := entry.get('summary') or title),
+                "published": entry.get('published', ''),
+                "source_url": url, # Keep track of original source
+                "_published_ts": calendar.timegm(published_parsed) if (published_parsed := entry.get('published_parsed')) else 0.0,
+                "_search_blob": f"{title} {description}".lower()
+            }
+            for entry in feed.entries
+        ]
+
+    async def _get_all_articles_cached(self) -> list:
+        """Returns articles from every feed merged newest-first, reused briefly across calls."""
+        with self._cache_lock:
+            cached = self._all_articles_cache.get('all')
+        if cached is not None:
+            return cached
+        
+        # Fetch all feeds concurrently so total latency is the slowest feed, not the sum,
+        # over one pooled client, reusing connections to shared hosts
+        # Semaphores are per refresh because asyncio primitives bind to the running event loop
+        host_semaphores = defaultdict(lambda: asyncio.Semaphore(MAX_CONCURRENT_REQUESTS_PER_HOST))
+        async with self._create_client() as client:
+            feed_results = await asyncio.gather(*(
+                self._fetch_feed(client, feed.url, host_semaphores[feed.host])
+                for feed in self.rss_feeds
+            ))
+        
+        # Each feed is already sorted newest-first, so a k-way merge yields all articles in order
+        all_articles = list(heapq.merge(*feed_results, key=_published_key, reverse=True))
+        with self._cache_lock:
+            self._all_articles_cache['all'] = all_articles
+        return all_articles
+
+    def clear_cache(self):
+        """Drops all cached feed and merged article data."""
+        with self._cache_lock:
+            self.cache.clear()
+            self._all_articles_cache.clear()
+        logger.info("RSS cache cleared.")
+
+    async def get_relevant_articles(self, location_scope: str = 'National', max_articles: int = None) -> list:
         """
         Fetches articles from all configured RSS feeds and filters them by relevance
-        to location scope and property categories.
+        to location scope and property categories, newest first.
         """
-        all_articles = []
-        for feed_config in self.rss_feeds:
-            articles = await self._fetch_feed(feed_config['url'])
-            all_articles.extend(articles)
+        all_articles = await self._get_all_articles_cached()
         
         # Simple filtering logic (can be enhanced)
-        filtered_articles = []
-        for article in all_articles:
-            is_relevant_location = False
-            if location_scope == 'National':
-                is_relevant_location = True # All articles are relevant for national scope
-            else:
-                # Check if article title or description contains location keywords
-                location_keywords = [location_scope.lower()] # Simplified, can use more specific keywords
-                if any(keyword in article['title'].lower() or keyword in article['description'].lower() for keyword in location_keywords):
-                    is_relevant_location = True
+        # Check location against article title/description; simplified, can use more specific keywords
+        location_pattern = None if location_scope == 'National' else re.compile(re.escape(location_scope.lower()))
+        
+        def is_relevant(article: dict) -> bool:
+            text = article['_search_blob']
             
-            # Check if article is within property categories (can be enhanced with LLM filtering)
-            is_relevant_category = False
-            property_categories = ["property", "real estate", "housing", "market", "investment", "home"]
-            if any(keyword in article['title'].lower() or keyword in article['description'].lower() for keyword in property_categories):
-                is_relevant_category = True
+            # All articles are relevant for national scope
+            if location_pattern and not location_pattern.search(text):
+                return False
             
-            if is_relevant_location and is_relevant_category:
-                filtered_articles.append(article)
+            # Check if article is within property categories (can be enhanced with LLM filtering)
+            return _PROPERTY_CATEGORY_PATTERN.search(text) is not None
+        
+        filtered_articles = list(itertools.islice(filter(is_relevant, all_articles), max_articles))
         
         logger.info(f"Filtered down to {len(filtered_articles)} relevant articles for {location_scope}.")
         return filtered_articles
@@ -6,12 +6,45 @@ Generate charts, infographics, and visual content for Australian property analys
 import requests
 import logging
 import base64
+import hashlib
 import io
+import threading
+import orjson
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Dict, Optional, List
+from requests.adapters import HTTPAdapter
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Prompt text is fixed apart from a few slots, so it is built once as %-format templates
+_CHART_DESCRIPTIONS = MappingProxyType({
+    'bar': 'professional bar chart',
+    'line': 'clean line graph',
+    'pie': 'modern pie chart',
+    'area': 'filled area chart'
+})
+
+_CHART_PROMPT_TEMPLATE = """Create a %s showing Australian property market data. 
+        Professional business style with clean design, modern colors (blues and greens), 
+        clear labels and grid lines. Data represents: %s. 
+        Include title, axis labels, and professional formatting suitable for property reports. 
+        Style: corporate, clean, modern data visualization."""
+
+_INFOGRAPHIC_PROMPT_TEMPLATE = """Create a professional property infographic for %s, Australian. 
+        Modern design with Australian city colors (blue, green, gold). Include sections for: 
+        property prices, development activity, infrastructure, and key statistics. 
+        Clean layout with icons, charts, and professional typography. 
+        Style: real estate marketing, professional, informative, modern Australian design."""
+
+_TREND_PROMPT = """Create a professional trend analysis visualization for Australian property market. 
+        Show market trends with directional arrows, percentage changes, and time series data. 
+        Modern business style with professional color scheme (blues, greens, grays). 
+        Include trend lines, data points, and clear indicators for growth/decline. 
+        Style: financial analysis, professional dashboard, clean modern design."""
+
 class StabilityService:
     """Service for generating property visualizations using Stability AI"""
     
@@ -22,10 +55,25 @@ class StabilityService:
         self.default_params = Config.STABILITY_CONFIG['default_params']
         self.enabled = Config.STABILITY_ENABLED and bool(self.api_key)
         
+        # Shared session keeps TLS connections to the API open across generations
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        })
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='stability')
+        
+        # Prompts are deterministic for the same input data, so generated images are reused for a day
+        self._image_cache = TTLCache(maxsize=128, ttl=86400)
+        self._image_cache_lock = threading.Lock()
+        self._connection_check_cache = TTLCache(maxsize=1, ttl=60)
+        self._connection_check_lock = threading.Lock()
+        
         if not self.enabled:
             logger.warning("Stability AI service disabled - API key not configured")
     
-    def generate_property_chart(self, data: Dict, chart_type: str = 'bar') -> Dict:
+    def generate_property_chart(self, data: Dict, chart_type: str = 'bar', return_bytes: bool = False) -> Dict:
         """Generate property data visualization chart"""
         if not self.enabled:
             return self._error_response("Stability AI service not enabled")
@@ -35,7 +83,7 @@ class StabilityService:
             prompt = self._create_chart_prompt(data, chart_type)
             
             # Generate image using Stability AI
-            response = self._generate_image(prompt, 'chart_generation')
+            response = self._generate_image(prompt, 'chart_generation', return_bytes=return_bytes)
             
             if response['success']:
                 return {
@@ -53,7 +101,7 @@ class StabilityService:
             logger.error(f"Property chart generation failed: {e}")
             return self._error_response(f"Chart generation failed: {str(e)}")
     
-    def generate_suburb_infographic(self, suburb_data: Dict) -> Dict:
+    def generate_suburb_infographic(self, suburb_data: Dict, return_bytes: bool = False) -> Dict:
         """Generate suburb information infographic"""
         if not self.enabled:
             return self._error_response("Stability AI service not enabled")
@@ -63,7 +111,7 @@ class StabilityService:
             prompt = self._create_infographic_prompt(suburb_data)
             
             # Generate infographic
-            response = self._generate_image(prompt, 'infographic')
+            response = self._generate_image(prompt, 'infographic', return_bytes=return_bytes)
             
             if response['success']:
                 return {
@@ -81,7 +129,7 @@ class StabilityService:
             logger.error(f"Suburb infographic generation failed: {e}")
             return self._error_response(f"Infographic generation failed: {str(e)}")
     
-    def generate_trend_visualization(self, trend_data: List[Dict]) -> Dict:
+    def generate_trend_visualization(self, trend_data: List[Dict], return_bytes: bool = False) -> Dict:
         """Generate trend visualization for property market data"""
         if not self.enabled:
             return self._error_response("Stability AI service not enabled")
@@ -91,7 +139,7 @@ class StabilityService:
             prompt = self._create_trend_prompt(trend_data)
             
             # Generate visualization
-            response = self._generate_image(prompt, 'chart_generation')
+            response = self._generate_image(prompt, 'chart_generation', return_bytes=return_bytes)
             
             if response['success']:
                 return {
@@ -110,15 +158,42 @@ class StabilityService:
             logger.error(f"Trend visualization generation failed: {e}")
             return self._error_response(f"Trend visualization failed: {str(e)}")
     
-    def _generate_image(self, prompt: str, model_type: str = 'chart_generation') -> Dict:
-        """Generate image using Stability AI API"""
+    def generate_batch(self, specs: List[Dict]) -> Dict[int, Dict]:
+        """Generate several visualizations in parallel, keyed by spec index"""
+        if not self.enabled:
+            return {index: self._error_response("Stability AI service not enabled") for index in range(len(specs))}
+        
+        generators = {
+            'chart': lambda spec: self.generate_property_chart(spec.get('data', {}), spec.get('chart_type', 'bar')),
+            'infographic': lambda spec: self.generate_suburb_infographic(spec.get('data', {})),
+            'trend': lambda spec: self.generate_trend_visualization(spec.get('data', []))
+        }
+        
+        futures = {}
+        results = {}
+        for index, spec in enumerate(specs):
+            generator = generators.get(spec.get('type'))
+            if generator:
+                futures[index] = self._executor.submit(generator, spec)
+            else:
+                results[index] = self._error_response(f"Unknown visualization type: {spec.get('type')}")
+        
+        for index, future in futures.items():
+            results[index] = future.result()
+        
+        return results
+    
+    def _generate_image(self, prompt: str, model_type: str = 'chart_generation', return_bytes: bool = False) -> Dict:
+        """Generate image using Stability AI API, as base64 text or raw PNG bytes"""
         try:
             model = self.models.get(model_type, self.models['chart_generation'])
+            cache_key = hashlib.blake2b(f"{prompt}|{model}|{return_bytes}".encode(), digest_size=16).hexdigest()
             
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
+            with self._image_cache_lock:
+                cached = self._image_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached Stability AI image for model {model}")
+                return cached
             
             payload = {
                 'text_prompts': [{'text': prompt}],
@@ -129,23 +204,30 @@ class StabilityService:
                 'samples': 1
             }
             
-            response = requests.post(
+            # Asking for image/png returns the raw PNG body, skipping the base64 round trip
+            response = self.session.post(
                 f"{self.base_url}/generation/{model}/text-to-image",
-                headers=headers,
-                json=payload,
+                headers={'Accept': 'image/png' if return_bytes else 'application/json'},
+                data=orjson.dumps(payload),
                 timeout=60
             )
             
             if response.status_code == 200:
-                data = response.json()
-                # Extract base64 image data
-                image_data = data['artifacts'][0]['base64']
+                if return_bytes:
+                    image_data = response.content
+                else:
+                    data = orjson.loads(response.content)
+                    # Extract base64 image data
+                    image_data = data['artifacts'][0]['base64']
                 
-                return {
+                result = {
                     'success': True,
                     'image_data': image_data,
                     'model_used': model
                 }
+                with self._image_cache_lock:
+                    self._image_cache[cache_key] = result
+                return result
             else:
                 logger.error(f"Stability AI API error: {response.status_code} - {response.text}")
                 return self._error_response(f"API error: {response.status_code}")
@@ -156,36 +238,16 @@ class StabilityService:
     
     def _create_chart_prompt(self, data: Dict, chart_type: str) -> str:
         """Create prompt for property chart generation"""
-        chart_description = {
-            'bar': 'professional bar chart',
-            'line': 'clean line graph',
-            'pie': 'modern pie chart',
-            'area': 'filled area chart'
-        }.get(chart_type, 'professional bar chart')
-        
-        return f"""Create a {chart_description} showing Australian property market data. 
-        Professional business style with clean design, modern colors (blues and greens), 
-        clear labels and grid lines. Data represents: {data.get('title', 'Property Market Analysis')}. 
-        Include title, axis labels, and professional formatting suitable for property reports. 
-        Style: corporate, clean, modern data visualization."""
+        chart_description = _CHART_DESCRIPTIONS.get(chart_type, _CHART_DESCRIPTIONS['bar'])
+        return _CHART_PROMPT_TEMPLATE % (chart_description, data.get('title', 'Property Market Analysis'))
     
     def _create_infographic_prompt(self, suburb_data: Dict) -> str:
         """Create prompt for suburb infographic"""
-        suburb_name = suburb_data.get('name', 'Australian Suburb')
-        
-        return f"""Create a professional property infographic for {suburb_name}, Australian. 
-        Modern design with Australian city colors (blue, green, gold). Include sections for: 
-        property prices, development activity, infrastructure, and key statistics. 
-        Clean layout with icons, charts, and professional typography. 
-        Style: real estate marketing, professional, informative, modern Australian design."""
+        return _INFOGRAPHIC_PROMPT_TEMPLATE % suburb_data.get('name', 'Australian Suburb')
     
     def _create_trend_prompt(self, trend_data: List[Dict]) -> str:
         """Create prompt for trend visualization"""
-        return f"""Create a professional trend analysis visualization for Australian property market. 
-        Show market trends with directional arrows, percentage changes, and time series data. 
-        Modern business style with professional color scheme (blues, greens, grays). 
-        Include trend lines, data points, and clear indicators for growth/decline. 
-        Style: financial analysis, professional dashboard, clean modern design."""
+        return _TREND_PROMPT
     
     def _error_response(self, error_msg: str) -> Dict:
         """Standardized error response"""
@@ -206,23 +268,31 @@ class StabilityService:
         }
     
     def test_connection(self) -> Dict:
-        """Test connection to Stability AI API"""
+        """Test connection to Stability AI API with a cheap account lookup"""
         if not self.enabled:
             return self._error_response("Service not enabled")
         
+        # Health checks are polled frequently, so the last result is reused for a minute
+        with self._connection_check_lock:
+            cached = self._connection_check_cache.get('result')
+        if cached is not None:
+            return cached
+        
         try:
-            # Test with minimal image generation
-            test_prompt = "Simple blue circle on white background, minimal, clean"
-            response = self._generate_image(test_prompt)
+            response = self.session.get(f"{self.base_url}/user/account", timeout=5)
             
-            if response['success']:
-                return {
+            if response.status_code == 200:
+                result = {
                     'success': True,
-                    'message': 'Stability AI connection successful',
-                    'model_tested': response.get('model_used')
+                    'message': 'Stability AI connection successful'
                 }
             else:
-                return response
+                logger.error(f"Stability AI connection test failed: {response.status_code} - {response.text}")
+                result = self._error_response(f"API error: {response.status_code}")
                 
         except Exception as e:
-            return self._error_response(f"Connection test failed: {str(e)}")
\ No newline at end of file
+            result = self._error_response(f"Connection test failed: {str(e)}")
+        
+        with self._connection_check_lock:
+            self._connection_check_cache['result'] = result
+        return result
@@ -1,15 +1,209 @@
 import os
+import re
+import string
+import atexit
+import asyncio
 import logging
+import threading
+import time
+import uuid
+import httpx
+from cachetools import TTLCache
 from datetime import datetime
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from database import PropertyDatabase
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive pool shared by all outbound HTTP so TLS sessions are reused between calls
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=20, keepalive_expiry=90.0)
+_http_client = None
+_http_client_pid = None
+_http_client_lock = threading.Lock()
+
+def _get_http_client() -> httpx.Client:
+    """Return this process's pooled sync client, created on first use"""
+    global _http_client, _http_client_pid
+    # Keyed by PID so workers forked from a preloaded parent never share its sockets
+    with _http_client_lock:
+        if _http_client is None or _http_client_pid != os.getpid():
+            _http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=60.0)
+            _http_client_pid = os.getpid()
+            atexit.register(_http_client.close)
+        return _http_client
+
+# Filler words ignored when matching rephrased questions against cached answers
+_QUESTION_STOPWORDS = frozenset({
+    'a', 'an', 'the', 'in', 'on', 'of', 'for', 'to', 'and', 'or', 'is', 'are', 'what',
+    'whats', 'how', 'which', 'about', 'any', 'there', 'me', 'tell', 'show', 'with', 'do', 'does'
+})
+_QUESTION_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Council feed entries worth keeping; one case-insensitive scan per title
+_RSS_KEYWORD_RE = re.compile(r"development|planning|infrastructure|property", re.IGNORECASE)
+
+# Constant Claude instructions; only the question varies per call, so this prefix can be cached server-side
+BRISBANE_SYSTEM_PROMPT = """You are a Brisbane property research specialist. Analyze the user's question and provide insights.
+
+Please provide:
+1. What type of property question this is (development, market, infrastructure, zoning, etc.)
+2. Which specific Brisbane suburbs/areas are most relevant
+3. What data sources would help answer this question
+4. Key insights to look for in the data
+
+Keep your response concise and focused specifically on Brisbane, Queensland, Australia."""
+
+# Startup model probes give up quickly so an unresponsive model falls through to the next candidate
+MODEL_PROBE_TIMEOUT_SECONDS = 10
+
+# The question analysis is a short classification, so the startup probe prefers the lowest-latency
+# model and falls back to the larger ones only when it is unavailable
+CLAUDE_FAST_MODELS = (
+    "claude-3-haiku-20240307",     # Haiku - your JS app uses this
+    "claude-3-5-sonnet-20241022",  # Latest Sonnet - your JS app uses this
+    "claude-3-sonnet-20240229"     # Original Sonnet
+)
+
+# Output budgets sized to what the final answer uses; temperature 0 keeps cached answers reproducible
+CLAUDE_MAX_TOKENS = 400
+CLAUDE_STOP_SEQUENCES = ["\n\n---"]
+GEMINI_GENERATION_CONFIG = {'temperature': 0.0, 'max_output_tokens': 700}
+
+# Prompt scaffolds are byte-stable so identical questions produce identical cache keys
+CLAUDE_PROMPT_TEMPLATE = 'Question: "{question}"'
+
+GEMINI_PROMPT_TEMPLATE = """You are a Brisbane property market analyst. Based on this research question and initial analysis, provide a comprehensive answer:
+
+Question: "{question}"
+
+Initial Analysis: {claude_analysis}
+
+Data Sources Available: {data_sources} Brisbane property data sources
+
+Please provide a detailed Brisbane property market analysis that directly answers the question. Include:
+- Specific Brisbane suburbs and areas
+- Current market trends and data
+- Investment or development implications
+- Professional insights for property industry
+
+Focus on actionable information for Brisbane property professionals."""
+
+def _split_template(template: str, *fields: str) -> List[str]:
+    """Split a str.format template into the literal text around the given fields, in order"""
+    pieces = list(string.Formatter().parse(template))
+    if tuple(name for _, name, _, _ in pieces if name is not None) != fields:
+        raise ValueError(f"Template fields do not match {fields}")
+    return [literal for literal, _, _, _ in pieces] + ([''] if pieces[-1][1] is not None else [])
+
+# Per-request prompts are built by concatenating pre-split literals, skipping template parsing on each call
+_CLAUDE_PROMPT_HEAD, _CLAUDE_PROMPT_TAIL = _split_template(CLAUDE_PROMPT_TEMPLATE, 'question')
+(_GEMINI_PROMPT_HEAD, _GEMINI_PROMPT_AFTER_QUESTION,
+ _GEMINI_PROMPT_AFTER_ANALYSIS, _GEMINI_PROMPT_TAIL) = _split_template(
+    GEMINI_PROMPT_TEMPLATE, 'question', 'claude_analysis', 'data_sources'
+)
+
+def _build_claude_prompt(question: str) -> str:
+    """Fill CLAUDE_PROMPT_TEMPLATE"""
+    return _CLAUDE_PROMPT_HEAD + question + _CLAUDE_PROMPT_TAIL
+
+def _build_gemini_prompt(question: str, claude_analysis: str, data_sources: int) -> str:
+    """Fill GEMINI_PROMPT_TEMPLATE"""
+    return (_GEMINI_PROMPT_HEAD + question + _GEMINI_PROMPT_AFTER_QUESTION + claude_analysis
+            + _GEMINI_PROMPT_AFTER_ANALYSIS + str(data_sources) + _GEMINI_PROMPT_TAIL)
+
+# Several questions share one call; answers come back under numbered headers and are split apart
+CLAUDE_BATCH_PROMPT_TEMPLATE = """Analyze each of the following questions separately.
+Start the answer to each question with a line of the form "### <number>:" and answer every question.
+
+{questions}"""
+
+GEMINI_BATCH_PROMPT_TEMPLATE = """You are a Brisbane property market analyst. Answer each research question below using its initial analysis.
+Start the answer to each question with a line of the form "### <number>:" and answer every question.
+
+Data Sources Available: {data_sources} Brisbane property data sources
+
+For each answer include specific Brisbane suburbs and areas, current market trends and data, investment or development implications, and professional insights for property industry.
+
+{questions}"""
+
+_BATCH_ANSWER_HEADER_RE = re.compile(r"^###[ \t]*(\d+)[ \t]*:?", re.MULTILINE)
+
+# Static sample sources, built once; entries are read-only views
+MOCK_BRISBANE_DATA = tuple(MappingProxyType(source) for source in (
+    {
+        'source': 'Brisbane City Council',
+        'title': 'Brisbane Development Applications - January 2025',
+        'summary': 'Recent development applications show continued growth in South Brisbane and Fortitude Valley areas with focus on mixed-use developments.',
+        'type': 'government_data',
+        'date': '2025-01-15'
+    },
+    {
+        'source': 'Property Observer',
+        'title': 'Brisbane Property Market Update',
+        'summary': 'Brisbane property market showing sustained growth with particular strength in inner-city areas. Paddington and New Farm leading growth.',
+        'type': 'market_analysis',
+        'date': '2025-01-14'
+    },
+    {
+        'source': 'Queensland Government',
+        'title': 'Cross River Rail Property Impact Study',
+        'summary': 'Infrastructure investment analysis shows 20-30% property value uplift within 800m of new stations. Woolloongabba and South Brisbane most affected.',
+        'type': 'infrastructure_news',
+        'date': '2025-01-12'
+    }
+))
+
+def _semantic_key(question: str) -> str:
+    """Reduce a question to its content words, in their original order, as a cache key"""
+    # Word order is kept so "A vs B" and "B vs A" never share an answer
+    return ' '.join(word for word in _QUESTION_WORD_RE.findall(question.lower()) if word not in _QUESTION_STOPWORDS)
+
+def _split_batch_answers(text: str, count: int) -> Optional[List[str]]:
+    """Split a numbered batch response into per-question answers, or None if any answer is missing"""
+    headers = list(_BATCH_ANSWER_HEADER_RE.finditer(text))
+    answers = {}
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(text)
+        answers[int(header.group(1))] = text[header.end():end].strip()
+    
+    if any(not answers.get(number) for number in range(1, count + 1)):
+        return None
+    return [answers[number] for number in range(1, count + 1)]
+
+def _first_working_model(probe: Callable[[str], None], model_names: List[str], provider: str) -> Optional[str]:
+    """Probe candidate models in priority order and return the first one that answers"""
+    # Sequential, so lower-priority models are only tried (and billed) when the preferred ones fail
+    for model_name in model_names:
+        try:
+            probe(model_name)
+        except Exception as model_error:
+            logger.warning(f"{provider} model {model_name} failed: {str(model_error)}")
+            continue
+        logger.info(f"{provider} connection successful with model: {model_name}")
+        return model_name
+    return None
+
 class SimpleLLMProcessor:
-    def __init__(self):
+    def __init__(self, database: Optional[PropertyDatabase] = None):
         """Initialize LLM clients with working model names from your other project"""
+        # Remembers the last model that passed a probe so restarts can skip re-probing
+        self.database = database or PropertyDatabase()
         self.claude_client = None
+        self._claude_api_key = None
         self.gemini_model = None
+        # Async HTTP and Claude clients per event loop, since pooled async connections belong to the loop that opened them
+        self._loop_clients = {}
+        self._loop_clients_lock = threading.Lock()
+        # Answers keyed by normalized question so rephrasings skip the LLM call
+        self._response_cache = TTLCache(maxsize=512, ttl=6 * 3600)
+        # Validators and entries from the last council RSS fetch
+        self._rss_etag = None
+        self._rss_last_modified = None
+        self._rss_cache = None
+        # Background jobs run on one dedicated event loop, started on first submit
+        self._job_loop_lock = threading.Lock()
+        self._job_loop = None
         
         # Initialize Claude safely
         self._init_claude()
@@ -17,105 +211,86 @@ class SimpleLLMProcessor:
         # Initialize Gemini safely
         self._init_gemini()
     
-def _init_claude(self):
-    """Initialize Claude with fixed initialization pattern"""
-    try:
-        import anthropic
-        claude_key = os.getenv('CLAUDE_API_KEY')
-        if claude_key:
-            # Use explicit, minimal initialization - no extra parameters
-            self.claude_client = anthropic.Anthropic(
-                api_key=claude_key.strip()
-                # Remove any other parameters that might cause conflicts
-            )
-            logger.info("Claude client initialized successfully")
+    def _init_claude(self):
+        """Initialize Claude with fixed initialization pattern"""
+        try:
+            import anthropic
+            claude_key = os.getenv('CLAUDE_API_KEY')
+            if claude_key:
+                # Use explicit, minimal initialization - no extra parameters
+                self.claude_client = anthropic.Anthropic(
+                    api_key=claude_key.strip(),
+                    http_client=_get_http_client()
+                )
+                # Async clients for pipeline calls are created per event loop by _async_clients
+                self._claude_api_key = claude_key.strip()
+                logger.info("Claude client initialized successfully")
             
-            # Test with models that work in your other project
-            working_models = [
-                "claude-3-5-sonnet-20241022",  # Latest Sonnet - your JS app uses this
-                "claude-3-haiku-20240307",     # Haiku fallback - your JS app uses this
-                "claude-3-sonnet-20240229"     # Original Sonnet
-            ]
+                # Test with models that work in your other project, fastest first
+                working_models = list(CLAUDE_FAST_MODELS)
             
-            test_successful = False
-            for model_name in working_models:
-                try:
-                    # Minimal test call - exactly like your working JS app
-                    test_response = self.claude_client.messages.create(
+                test_successful = False
+            
+                # Reuse the model verified by a recent startup instead of probing again
+                cached_model = self.database.get_cached_model('claude_fast')
+                if cached_model:
+                    logger.info(f"Using cached Claude model: {cached_model}")
+                    self.working_claude_model_fast = cached_model
+                    test_successful = True
+                    working_models = []
+            
+                def probe_claude(model_name):
+                    # Minimal test call - one output token is enough to prove the model answers
+                    self.claude_client.messages.create(
                         model=model_name,
-                        max_tokens=10,
-                        messages=[{"role": "user", "content": "Hello"}]
+                        max_tokens=1,
+                        messages=[{"role": "user", "content": "Hello"}],
+                        timeout=MODEL_PROBE_TIMEOUT_SECONDS
                     )
-                    logger.info(f"Claude connection successful with model: {model_name}")
-                    self.working_claude_model = model_name
+            
+                model_name = _first_working_model(probe_claude, working_models, 'Claude')
+                if model_name:
+                    self.working_claude_model_fast = model_name
+                    self.database.store_cached_model('claude_fast', model_name)
                     test_successful = True
-                    break
-                except Exception as model_error:
-                    logger.warning(f"Claude model {model_name} failed: {str(model_error)}")
-                    continue
             
-            if not test_successful:
-                logger.error("All Claude models failed during initialization")
-                self.claude_client = None
+                if not test_successful:
+                    logger.error("All Claude models failed during initialization")
+                    self.claude_client = None
                 
-        else:
-            logger.warning("CLAUDE_API_KEY not found")
+            else:
+                logger.warning("CLAUDE_API_KEY not found")
+                self.claude_client = None
+        except ImportError:
+            logger.error("anthropic library not installed")
+            self.claude_client = None
+        except Exception as e:
+            logger.error(f"Claude initialization failed: {str(e)}")
             self.claude_client = None
-    except ImportError:
-        logger.error("anthropic library not installed")
-        self.claude_client = None
-    except Exception as e:
-        logger.error(f"Claude initialization failed: {str(e)}")
-        self.claude_client = None
-
-def analyze_with_claude(self, question: str) -> Dict:
-    """Analyze question with Claude using working model - FIXED VERSION"""
-    if not self.claude_client:
-        return {
-            'success': False,
-            'analysis': f'Claude analysis not available for: {question}',
-            'error': 'Claude client not available'
-        }
     
-    try:
-        prompt = f"""You are a Brisbane property research specialist. Analyze this question and provide insights:
-
-Question: "{question}"
-
-Please provide:
-1. What type of property question this is (development, market, infrastructure, zoning, etc.)
-2. Which specific Brisbane suburbs/areas are most relevant
-3. What data sources would help answer this question
-4. Key insights to look for in the data
-
-Keep your response concise and focused specifically on Brisbane, Queensland, Australia."""
-
-        # Use the working model from initialization - exactly like your JS app
-        model_to_use = getattr(self, 'working_claude_model', 'claude-3-5-sonnet-20241022')
-        
-        # Minimal, explicit API call - matching your working JS pattern
-        response = self.claude_client.messages.create(
-            model=model_to_use,
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return {
-            'success': True,
-            'analysis': response.content[0].text,
-            'model_used': model_to_use,
-            'error': None
-        }
-        
-    except Exception as e:
-        logger.error(f"Claude analysis failed: {str(e)}")
-        return {
-            'success': False,
-            'analysis': f'Claude analysis failed for: {question}',
-            'error': str(e)
-        }
-
-
+    def _async_clients(self) -> tuple:
+        """Return the running event loop's (httpx, AsyncAnthropic) clients, created on first use"""
+        loop = asyncio.get_running_loop()
+        with self._loop_clients_lock:
+            clients = self._loop_clients.get(loop)
+            if clients is None:
+                # Clients of loops that have since closed cannot be reused, so they are dropped here
+                for closed_loop in [known for known in self._loop_clients if known.is_closed()]:
+                    del self._loop_clients[closed_loop]
+                http_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=60.0)
+                claude_client = None
+                if self._claude_api_key:
+                    import anthropic
+                    claude_client = anthropic.AsyncAnthropic(api_key=self._claude_api_key, http_client=http_client)
+                clients = self._loop_clients[loop] = (http_client, claude_client)
+            return clients
+    
+    @property
+    def claude_async_client(self):
+        """Async Claude client bound to the running event loop, or None when Claude is unavailable"""
+        if self.claude_client is None:
+            return None
+        return self._async_clients()[1]
     
     def _init_gemini(self):
         """Initialize Gemini with working model names from your other project"""
@@ -133,17 +308,29 @@ Keep your response concise and focused specifically on Brisbane, Queensland, Aus
                 ]
                 
                 test_successful = False
-                for model_name in working_models:
-                    try:
-                        self.gemini_model = genai.GenerativeModel(model_name)
-                        test_response = self.gemini_model.generate_content("Hello")
-                        logger.info(f"Gemini connection successful with model: {model_name}")
-                        self.working_gemini_model = model_name
-                        test_successful = True
-                        break
-                    except Exception as model_error:
-                        logger.warning(f"Gemini model {model_name} failed: {str(model_error)}")
-                        continue
+                
+                # Reuse the model verified by a recent startup instead of probing again
+                cached_model = self.database.get_cached_model('gemini')
+                if cached_model:
+                    logger.info(f"Using cached Gemini model: {cached_model}")
+                    self.gemini_model = genai.GenerativeModel(cached_model)
+                    self.working_gemini_model = cached_model
+                    test_successful = True
+                    working_models = []
+                
+                def probe_gemini(model_name):
+                    genai.GenerativeModel(model_name).generate_content(
+                        "Hello",
+                        generation_config={'max_output_tokens': 1},
+                        request_options={'timeout': MODEL_PROBE_TIMEOUT_SECONDS}
+                    )
+                
+                model_name = _first_working_model(probe_gemini, working_models, 'Gemini')
+                if model_name:
+                    self.gemini_model = genai.GenerativeModel(model_name)
+                    self.working_gemini_model = model_name
+                    self.database.store_cached_model('gemini', model_name)
+                    test_successful = True
                 
                 if not test_successful:
                     logger.error("All Gemini models failed")
@@ -157,8 +344,13 @@ Keep your response concise and focused specifically on Brisbane, Queensland, Aus
             logger.error(f"Gemini initialization failed: {str(e)}")
             self.gemini_model = None
     
-    def analyze_with_claude(self, question: str) -> Dict:
-        """Analyze question with Claude using working model"""
+    def _emit_chunk(self, chunk_queue: Optional[asyncio.Queue], stage: str, text: str):
+        """Forward generated text to a streaming consumer, if one is listening"""
+        if chunk_queue is not None and text:
+            chunk_queue.put_nowait({'stage': stage, 'text': text})
+    
+    async def analyze_with_claude(self, question: str, chunk_queue: Optional[asyncio.Queue] = None) -> Dict:
+        """Analyze question with Claude using working model, streaming text to chunk_queue"""
         if not self.claude_client:
             return {
                 'success': False,
@@ -166,34 +358,54 @@ Keep your response concise and focused specifically on Brisbane, Queensland, Aus
                 'error': 'Claude client not available'
             }
         
+        cache_key = ('claude', _semantic_key(question))
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached Claude analysis")
+            self._emit_chunk(chunk_queue, 'claude_analysis', cached['analysis'])
+            return cached
+        
         try:
-            prompt = f"""You are a Brisbane property research specialist. Analyze this question and provide insights:
-
-Question: "{question}"
-
-Please provide:
-1. What type of property question this is (development, market, infrastructure, zoning, etc.)
-2. Which specific Brisbane suburbs/areas are most relevant
-3. What data sources would help answer this question
-4. Key insights to look for in the data
-
-Keep your response concise and focused specifically on Brisbane, Queensland, Australia."""
+            prompt = _build_claude_prompt(question)
 
-            # Use the working model from initialization
-            model_to_use = getattr(self, 'working_claude_model', 'claude-3-5-sonnet-20241022')
+            # The analysis is a short classification, so it runs on the fastest model that passed the probe
+            model_to_use = self.working_claude_model_fast
             
-            response = self.claude_client.messages.create(
+            # Identical prompts are answered from the database without a network call
+            cached_text = self.database.cache_get(prompt, 'claude')
+            if cached_text is not None:
+                logger.info("Using exact-match cached Claude analysis")
+                self._emit_chunk(chunk_queue, 'claude_analysis', cached_text)
+                return {
+                    'success': True,
+                    'analysis': cached_text,
+                    'model_used': model_to_use,
+                    'error': None
+                }
+            
+            # The specialist instructions are a byte-identical system block marked for prompt caching
+            chunks = []
+            async with self.claude_async_client.messages.stream(
                 model=model_to_use,
-                max_tokens=1000,
+                max_tokens=CLAUDE_MAX_TOKENS,
+                temperature=0.0,
+                stop_sequences=CLAUDE_STOP_SEQUENCES,
+                system=[{"type": "text", "text": BRISBANE_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
                 messages=[{"role": "user", "content": prompt}]
-            )
+            ) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+                    self._emit_chunk(chunk_queue, 'claude_analysis', text)
             
-            return {
+            result = {
                 'success': True,
-                'analysis': response.content[0].text,
+                'analysis': ''.join(chunks),
                 'model_used': model_to_use,
                 'error': None
             }
+            self._response_cache[cache_key] = result
+            self.database.cache_set(prompt, 'claude', result['analysis'])
+            return result
             
         except Exception as e:
             logger.error(f"Claude analysis failed: {str(e)}")
@@ -203,8 +415,9 @@ Keep your response concise and focused specifically on Brisbane, Queensland, Aus
                 'error': str(e)
             }
     
-    def process_with_gemini(self, question: str, claude_analysis: str, data_sources: int = 3) -> Dict:
-        """Process with Gemini using working model"""
+    async def process_with_gemini(self, question: str, claude_analysis: str, data_sources: int = 3,
+                                  chunk_queue: Optional[asyncio.Queue] = None) -> Dict:
+        """Process with Gemini using working model, streaming text to chunk_queue"""
         if not self.gemini_model:
             return {
                 'success': False,
@@ -212,33 +425,49 @@ Keep your response concise and focused specifically on Brisbane, Queensland, Aus
                 'error': 'Gemini model not available'
             }
         
+        cache_key = ('gemini', _semantic_key(question), data_sources)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached Gemini analysis")
+            self._emit_chunk(chunk_queue, 'gemini_processing', cached['analysis'])
+            return cached
+        
         try:
-            prompt = f"""You are a Brisbane property market analyst. Based on this research question and initial analysis, provide a comprehensive answer:
-
-Question: "{question}"
+            prompt = _build_gemini_prompt(question, claude_analysis, data_sources)
 
-Initial Analysis: {claude_analysis}
-
-Data Sources Available: {data_sources} Brisbane property data sources
-
-Please provide a detailed Brisbane property market analysis that directly answers the question. Include:
-- Specific Brisbane suburbs and areas
-- Current market trends and data
-- Investment or development implications
-- Professional insights for property industry
-
-Focus on actionable information for Brisbane property professionals."""
-
-            response = self.gemini_model.generate_content(prompt)
-            
             model_used = getattr(self, 'working_gemini_model', 'gemini-1.5-flash')
             
-            return {
+            # Identical prompts are answered from the database without a network call
+            cached_text = self.database.cache_get(prompt, 'gemini')
+            if cached_text is not None:
+                logger.info("Using exact-match cached Gemini analysis")
+                self._emit_chunk(chunk_queue, 'gemini_processing', cached_text)
+                return {
+                    'success': True,
+                    'analysis': cached_text,
+                    'model_used': model_used,
+                    'error': None
+                }
+            
+            chunks = []
+            response = await self.gemini_model.generate_content_async(
+                prompt,
+                generation_config=GEMINI_GENERATION_CONFIG,
+                stream=True
+            )
+            async for chunk in response:
+                chunks.append(chunk.text)
+                self._emit_chunk(chunk_queue, 'gemini_processing', chunk.text)
+            
+            result = {
                 'success': True,
-                'analysis': response.text,
+                'analysis': ''.join(chunks),
                 'model_used': model_used,
                 'error': None
             }
+            self._response_cache[cache_key] = result
+            self.database.cache_set(prompt, 'gemini', result['analysis'])
+            return result
             
         except Exception as e:
             logger.error(f"Gemini processing failed: {str(e)}")
@@ -250,41 +479,32 @@ Focus on actionable information for Brisbane property professionals."""
     
     def get_mock_brisbane_data(self, question: str) -> List[Dict]:
         """Generate mock Brisbane data sources"""
-        return [
-            {
-                'source': 'Brisbane City Council',
-                'title': 'Brisbane Development Applications - January 2025',
-                'summary': 'Recent development applications show continued growth in South Brisbane and Fortitude Valley areas with focus on mixed-use developments.',
-                'type': 'government_data',
-                'date': '2025-01-15'
-            },
-            {
-                'source': 'Property Observer',
-                'title': 'Brisbane Property Market Update',
-                'summary': 'Brisbane property market showing sustained growth with particular strength in inner-city areas. Paddington and New Farm leading growth.',
-                'type': 'market_analysis',
-                'date': '2025-01-14'
-            },
-            {
-                'source': 'Queensland Government',
-                'title': 'Cross River Rail Property Impact Study',
-                'summary': 'Infrastructure investment analysis shows 20-30% property value uplift within 800m of new stations. Woolloongabba and South Brisbane most affected.',
-                'type': 'infrastructure_news',
-                'date': '2025-01-12'
-            }
-        ]
+        return list(MOCK_BRISBANE_DATA)
     
 
-    def scrape_brisbane_council_rss(self):
+    async def scrape_brisbane_council_rss(self):
         """Scrape real Brisbane City Council RSS"""
         try:
             import feedparser
             rss_url = "https://www.brisbane.qld.gov.au/about-council/news-media/news/rss"
-            feed = feedparser.parse(rss_url)
+            
+            # Conditional GET: an unchanged feed answers 304 with no body and the last parse is reused
+            request_headers = {}
+            if self._rss_etag:
+                request_headers['If-None-Match'] = self._rss_etag
+            if self._rss_last_modified:
+                request_headers['If-Modified-Since'] = self._rss_last_modified
+            
+            response = await self._async_clients()[0].get(rss_url, headers=request_headers, timeout=10)
+            if response.status_code == 304 and self._rss_cache is not None:
+                logger.info("Council RSS not modified, reusing previous entries")
+                return list(self._rss_cache)
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
             
             data = []
             for entry in feed.entries[:5]:
-                if any(keyword in entry.title.lower() for keyword in ['development', 'planning', 'infrastructure', 'property']):
+                if _RSS_KEYWORD_RE.search(entry.title):
                     data.append({
                         'source': 'Brisbane City Council',
                         'title': entry.title,
@@ -293,88 +513,277 @@ Focus on actionable information for Brisbane property professionals."""
                         'date': entry.published,
                         'type': 'government_news'
                     })
-            return data
+            
+            self._rss_etag = response.headers.get('ETag')
+            self._rss_last_modified = response.headers.get('Last-Modified')
+            self._rss_cache = data
+            return list(data)
         except Exception as e:
             logger.error(f"RSS scraping failed: {str(e)}")
             return self.get_mock_brisbane_data('')
 
 
-    def process_question(self, question: str) -> Dict:
+    async def stream_question(self, question: str) -> AsyncIterator[Dict]:
+        """Yield LLM text chunks as they are generated, then the final pipeline result"""
+        chunk_queue = asyncio.Queue()
+        pipeline_task = asyncio.create_task(self.process_question(question, chunk_queue))
+        
+        # process_question puts None on the queue once it has finished
+        while (update := await chunk_queue.get()) is not None:
+            yield {'status': 'chunk', **update}
+        
+        yield {'status': 'complete', 'data': await pipeline_task}
+    
+    async def process_question(self, question: str, chunk_queue: Optional[asyncio.Queue] = None) -> Dict:
         """Process a Brisbane property question through the full pipeline"""
         try:
-            # Stage 1: Claude Analysis
-            claude_result = self.analyze_with_claude(question)
+            # Stages 1 and 2 are independent: Claude analysis and the council RSS scrape run concurrently
+            claude_result, scraped_data = await asyncio.gather(
+                self.analyze_with_claude(question, chunk_queue),
+                self.scrape_brisbane_council_rss()
+            )
             
-            # Stage 2: Mock Data (represents scraped Brisbane data)
-            mock_data = self.get_mock_brisbane_data(question)
+            # Fall back to mock data (represents scraped Brisbane data) when no relevant entries were found
+            source_data = scraped_data or self.get_mock_brisbane_data(question)
             
-            # Stage 3: Gemini Processing
-            gemini_result = self.process_with_gemini(
+            # Stage 3: Gemini Processing (builds on Claude's analysis)
+            gemini_result = await self.process_with_gemini(
                 question, 
                 claude_result['analysis'], 
-                len(mock_data)
+                len(source_data),
+                chunk_queue
             )
             
             # Stage 4: Format Final Answer
-            final_answer = self.format_final_answer(
-                question, claude_result, gemini_result, mock_data
-            )
+            return self._build_result(question, claude_result, gemini_result, source_data)
             
+        except Exception as e:
+            logger.error(f"Question processing failed: {str(e)}")
             return {
+                'success': False,
+                'error': str(e),
+                'final_answer': f'Error processing question: {question}'
+            }
+        
+        finally:
+            if chunk_queue is not None:
+                chunk_queue.put_nowait(None)
+    
+    def _get_job_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop that runs submitted questions, once"""
+        with self._job_loop_lock:
+            if self._job_loop is None:
+                self._job_loop = asyncio.new_event_loop()
+                threading.Thread(target=self._job_loop.run_forever, name='llm-jobs', daemon=True).start()
+            return self._job_loop
+    
+    async def _run_question_job(self, job_id: str, question: str):
+        """Run one submitted question and persist its answer"""
+        await asyncio.to_thread(self.database.update_job, job_id, 'running')
+        start_time = time.time()
+        
+        try:
+            result = await self.process_question(question)
+            processing_time = time.time() - start_time
+            
+            # The insert blocks on SQLite, so it runs off the loop
+            query_id = await asyncio.to_thread(
+                self.database.store_query,
+                question, result['final_answer'], 'custom', processing_time, result['success']
+            )
+            await asyncio.to_thread(
+                self.database.update_job, job_id, 'complete' if result['success'] else 'failed',
+                result={**result, 'query_id': query_id, 'processing_time': processing_time},
+                error=result.get('error')
+            )
+            
+        except Exception as e:
+            logger.error(f"Question job {job_id} failed: {str(e)}")
+            await asyncio.to_thread(self.database.update_job, job_id, 'failed', error=str(e))
+    
+    def submit_question(self, question: str) -> str:
+        """Queue a question for background processing and return its job ID"""
+        job_loop = self._get_job_loop()
+        job_id = uuid.uuid4().hex
+        # Jobs live in the shared database so any worker process can report on them
+        self.database.create_job(job_id, question, 'custom')
+        asyncio.run_coroutine_threadsafe(self._run_question_job(job_id, question), job_loop)
+        return job_id
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Return a snapshot of a submitted job, or None if it is unknown or expired"""
+        return self.database.get_job(job_id)
+    
+    def _build_result(self, question: str, claude_result: Dict, gemini_result: Dict, source_data: List[Dict]) -> Dict:
+        """Assemble the pipeline response for one question"""
+        final_answer = self.format_final_answer(
+            question, claude_result, gemini_result, source_data
+        )
+        
+        return {
+            'success': True,
+            'question': question,
+            'claude_result': claude_result,
+            'gemini_result': gemini_result,
+            'data_sources': len(source_data),
+            'final_answer': final_answer,
+            'processing_stages': {
+                'claude_success': claude_result['success'],
+                'gemini_success': gemini_result['success'],
+                'data_sources_found': len(source_data),
+                'claude_model': claude_result.get('model_used', 'unknown'),
+                'gemini_model': gemini_result.get('model_used', 'unknown')
+            }
+        }
+    
+    async def _analyze_batch_with_claude(self, questions: List[str]) -> Optional[List[Dict]]:
+        """Analyze several questions in one Claude call; None means the caller should go per question"""
+        if not self.claude_client:
+            return None
+        
+        prompt = CLAUDE_BATCH_PROMPT_TEMPLATE.format(
+            questions='\n'.join(f'{number}. "{question}"' for number, question in enumerate(questions, 1))
+        )
+        try:
+            response = await self.claude_async_client.messages.create(
+                model=self.working_claude_model_fast,
+                max_tokens=CLAUDE_MAX_TOKENS * len(questions),
+                temperature=0.0,
+                system=[{"type": "text", "text": BRISBANE_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+                messages=[{"role": "user", "content": prompt}]
+            )
+        except Exception as e:
+            logger.error(f"Batched Claude analysis failed: {str(e)}")
+            return None
+        
+        answers = _split_batch_answers(response.content[0].text, len(questions))
+        if answers is None:
+            logger.warning("Batched Claude response could not be split, analyzing questions individually")
+            return None
+        
+        results = []
+        for question, analysis in zip(questions, answers):
+            result = {
                 'success': True,
-                'question': question,
-                'claude_result': claude_result,
-                'gemini_result': gemini_result,
-                'data_sources': len(mock_data),
-                'final_answer': final_answer,
-                'processing_stages': {
-                    'claude_success': claude_result['success'],
-                    'gemini_success': gemini_result['success'],
-                    'data_sources_found': len(mock_data),
-                    'claude_model': claude_result.get('model_used', 'unknown'),
-                    'gemini_model': gemini_result.get('model_used', 'unknown')
+                'analysis': analysis,
+                'model_used': self.working_claude_model_fast,
+                'error': None
+            }
+            self._response_cache[('claude', _semantic_key(question))] = result
+            results.append(result)
+        return results
+    
+    async def _process_batch_with_gemini(self, questions: List[str], claude_analyses: List[str],
+                                         data_sources: int) -> Optional[List[Dict]]:
+        """Answer several questions in one Gemini call; None means the caller should go per question"""
+        if not self.gemini_model:
+            return None
+        
+        prompt = GEMINI_BATCH_PROMPT_TEMPLATE.format(
+            data_sources=data_sources,
+            questions='\n\n'.join(
+                f'{number}. Question: "{question}"\nInitial Analysis: {analysis}'
+                for number, (question, analysis) in enumerate(zip(questions, claude_analyses), 1)
+            )
+        )
+        try:
+            response = await self.gemini_model.generate_content_async(
+                prompt,
+                generation_config={
+                    **GEMINI_GENERATION_CONFIG,
+                    'max_output_tokens': GEMINI_GENERATION_CONFIG['max_output_tokens'] * len(questions)
                 }
+            )
+            answers = _split_batch_answers(response.text, len(questions))
+        except Exception as e:
+            logger.error(f"Batched Gemini processing failed: {str(e)}")
+            return None
+        
+        if answers is None:
+            logger.warning("Batched Gemini response could not be split, processing questions individually")
+            return None
+        
+        model_used = getattr(self, 'working_gemini_model', 'gemini-1.5-flash')
+        results = []
+        for question, analysis in zip(questions, answers):
+            result = {
+                'success': True,
+                'analysis': analysis,
+                'model_used': model_used,
+                'error': None
             }
+            self._response_cache[('gemini', _semantic_key(question), data_sources)] = result
+            results.append(result)
+        return results
+    
+    async def process_questions(self, questions: List[str]) -> List[Dict]:
+        """Process several questions together, sharing one Claude and one Gemini call where possible"""
+        if len(questions) <= 1:
+            return [await self.process_question(question) for question in questions]
+        
+        try:
+            # The council scrape is question-independent, so one fetch serves the whole batch
+            claude_results, scraped_data = await asyncio.gather(
+                self._analyze_batch_with_claude(questions),
+                self.scrape_brisbane_council_rss()
+            )
+            if claude_results is None:
+                claude_results = await asyncio.gather(*(self.analyze_with_claude(question) for question in questions))
+            
+            source_data = scraped_data or self.get_mock_brisbane_data('')
+            claude_analyses = [result['analysis'] for result in claude_results]
+            
+            gemini_results = await self._process_batch_with_gemini(questions, claude_analyses, len(source_data))
+            if gemini_results is None:
+                gemini_results = await asyncio.gather(*(
+                    self.process_with_gemini(question, analysis, len(source_data))
+                    for question, analysis in zip(questions, claude_analyses)
+                ))
+            
+            return [
+                self._build_result(question, claude_result, gemini_result, source_data)
+                for question, claude_result, gemini_result in zip(questions, claude_results, gemini_results)
+            ]
             
         except Exception as e:
-            logger.error(f"Question processing failed: {str(e)}")
-            return {
+            logger.error(f"Batch question processing failed: {str(e)}")
+            return [{
                 'success': False,
                 'error': str(e),
                 'final_answer': f'Error processing question: {question}'
-            }
+            } for question in questions]
     
     def format_final_answer(self, question: str, claude_result: Dict, 
                           gemini_result: Dict, data_sources: List[Dict]) -> str:
         """Format the final answer combining all stages"""
         
-        answer = f"""# Brisbane Property Intelligence Analysis
+        parts = [f"""# Brisbane Property Intelligence Analysis
 
 ## Query: {question}
 
-"""
+"""]
         
         # Add main analysis from Gemini (if successful)
         if gemini_result['success']:
             model_used = gemini_result.get('model_used', 'Gemini')
-            answer += f"""## Market Analysis ({model_used})
+            parts.append(f"""## Market Analysis ({model_used})
 
 {gemini_result['analysis']}
 
-"""
+""")
         
         # Add Claude's strategic insights (if successful)
         if claude_result['success']:
             model_used = claude_result.get('model_used', 'Claude')
-            answer += f"""## Strategic Research Insights ({model_used})
+            parts.append(f"""## Strategic Research Insights ({model_used})
 
 {claude_result['analysis']}
 
-"""
+""")
         
         # If neither worked, add enhanced fallback
         if not claude_result['success'] and not gemini_result['success']:
-            answer += f"""## Enhanced Analysis
+            parts.append("""## Enhanced Analysis
 
 This Brisbane property question requires analysis of current market conditions, development activity, and infrastructure impact. Key areas of focus include:
 
@@ -384,17 +793,16 @@ This Brisbane property question requires analysis of current market conditions,
 
 Current market conditions show sustained growth in inner-city areas with particular strength in mixed-use developments and character housing precincts.
 
-"""
+""")
         
         # Add data sources section
-        answer += f"""## Data Sources Analyzed
+        parts.append("""## Data Sources Analyzed
 
-"""
-        for source in data_sources:
-            answer += f"- **{source['source']}** ({source['date']}): {source['title']}\n"
+""")
+        parts.extend(f"- **{source['source']}** ({source['date']}): {source['title']}\n" for source in data_sources)
         
         # Add processing summary
-        answer += f"""
+        parts.append(f"""
 ## Processing Summary
 
 - **Claude Analysis**: {'✅ Completed' if claude_result['success'] else '❌ Failed - ' + str(claude_result.get('error', 'Unknown error'))}
@@ -404,6 +812,7 @@ Current market conditions show sustained growth in inner-city areas with particu
 
 ---
 *Brisbane Property Intelligence - Multi-LLM Analysis System*
-"""
+""")
         
-        return answer
\ No newline at end of file
+        # Joined once at the end instead of re-copying the growing string on every +=
+        return ''.join(parts)
\ No newline at end of file
@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+
+from services.rss_service import FeedConfig, RSSService
+
+FEED_URL = "https://feeds.example.com/property.xml"
+FEED_BODY = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<item><title>Brisbane property market update</title><link>https://example.com/a</link>
+<description>Housing prices rose</description><pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def _service_with_transport(handler):
+    """Builds an RSSService over a single feed whose requests are answered by handler."""
+    service = RSSService()
+    service.rss_feeds = (FeedConfig(name="Test", url=FEED_URL, host="feeds.example.com", categories=(), locations=()),)
+    service._create_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+def test_not_modified_feed_reuses_previous_articles():
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=FEED_BODY, headers={"ETag": '"v1"'})
+
+    service = _service_with_transport(handler)
+    first = asyncio.run(service._get_all_articles_cached())
+    # Expire the TTL caches so the next refresh sends a conditional GET
+    service.clear_cache()
+    second = asyncio.run(service._get_all_articles_cached())
+
+    assert len(requests_seen) == 2
+    assert requests_seen[1].headers["If-None-Match"] == '"v1"'
+    assert [a["title"] for a in first] == ["Brisbane property market update"]
+    assert second == first
+
+
+def test_error_status_returns_no_articles():
+    service = _service_with_transport(lambda request: httpx.Response(500))
+
+    assert asyncio.run(service._get_all_articles_cached()) == []
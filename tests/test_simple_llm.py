@@ -0,0 +1,13 @@
+from simple_llm import _semantic_key
+
+
+def test_semantic_key_ignores_filler_words_and_case():
+    assert _semantic_key("What is the median price in Brisbane?") == _semantic_key("median price Brisbane")
+
+
+def test_semantic_key_keeps_word_order():
+    assert _semantic_key("Brisbane vs Sydney") != _semantic_key("Sydney vs Brisbane")
+
+
+def test_semantic_key_keeps_repeated_words():
+    assert _semantic_key("units units Paddington") != _semantic_key("units Paddington")